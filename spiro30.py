@@ -0,0 +1,368 @@
+import cv2
+import numpy as np
+import math
+import time
+import os
+import random
+from fractions import Fraction
+from numba import njit
+
+# Function to convert HSL to RGB inside the frame kernels
+@njit
+def hsl_to_rgb_kernel(h, s, l):
+    s = s / 100.0
+    l = l / 100.0
+    c = (1.0 - abs(2.0 * l - 1.0)) * s
+    x = c * (1.0 - abs((h / 60.0) % 2.0 - 1.0))
+    m = l - c / 2.0
+    r, g, b = 0.0, 0.0, 0.0
+
+    if 0 <= h < 60:
+        r, g, b = c, x, 0.0
+    elif 60 <= h < 120:
+        r, g, b = x, c, 0.0
+    elif 120 <= h < 180:
+        r, g, b = 0.0, c, x
+    elif 180 <= h < 240:
+        r, g, b = 0.0, x, c
+    elif 240 <= h < 300:
+        r, g, b = x, 0.0, c
+    elif 300 <= h < 360:
+        r, g, b = c, 0.0, x
+
+    return int((r + m) * 255), int((g + m) * 255), int((b + m) * 255)
+
+# Fused kernel for one frame: joints, pen point, trace colour and closure flag in a single call
+@njit
+def step_frame(frame_index, radii, speeds, angles, center_x, center_y, first_x, first_y, leave_frame,
+               closure_frame, tolerance_squared, hue, saturation, lightness, joints_x, joints_y):
+    # Chain the arms from the centre, truncating each arm like the Python loop does
+    x_current = center_x
+    y_current = center_y
+    joints_x[0] = x_current
+    joints_y[0] = y_current
+    for j in range(len(radii)):
+        angle = angles[j] + speeds[j] * frame_index
+        x_current += int(math.cos(angle) * radii[j])
+        y_current += int(math.sin(angle) * radii[j])
+        joints_x[j + 1] = x_current
+        joints_y[j + 1] = y_current
+
+    # Use the predicted closure frame when there is one, otherwise the distance to the first point
+    # once the pen has left the tolerance around it
+    if closure_frame >= 0:
+        closed = frame_index >= closure_frame
+    else:
+        distance_squared = (x_current - first_x) ** 2 + (y_current - first_y) ** 2
+        closed = frame_index > leave_frame and distance_squared <= tolerance_squared
+
+    r, g, b = hsl_to_rgb_kernel(hue, saturation, lightness)
+    return x_current, y_current, r, g, b, closed
+
+# Batched kernel advancing several frames at a time and returning arrays
+@njit
+def step_frames(start_frame, num_frames, radii, speeds, angles, center_x, center_y, first_x, first_y, leave_frame,
+                closure_frame, tolerance_squared, hue, hue_step, saturation, lightness):
+    joints_x = np.empty((num_frames, len(radii) + 1), dtype=np.int64)
+    joints_y = np.empty((num_frames, len(radii) + 1), dtype=np.int64)
+    colors = np.empty((num_frames, 3), dtype=np.int64)
+    closed = np.zeros(num_frames, dtype=np.bool_)
+    for k in range(num_frames):
+        _, _, r, g, b, closed[k] = step_frame(start_frame + k, radii, speeds, angles, center_x, center_y,
+                                               first_x, first_y, leave_frame, closure_frame, tolerance_squared,
+                                               hue, saturation, lightness, joints_x[k], joints_y[k])
+        colors[k, 0] = r
+        colors[k, 1] = g
+        colors[k, 2] = b
+        hue = (hue + hue_step) % 360
+
+    # The hue is returned so the next batch carries on from where this one stopped
+    return joints_x, joints_y, colors, closed, hue
+
+# Create 'videos' folder if it doesn't exist
+if not os.path.exists('videos'):
+    os.makedirs('videos')
+
+# Get the current epoch time for the video filename
+epoch_time = int(time.time())
+output_file = os.path.join('videos', f'output_video_{epoch_time}.mp4')
+
+# Video configuration
+width = 1920  # Resolution
+height = 1080
+fps = 60  # Lower FPS
+fourcc = cv2.VideoWriter_fourcc(*'mp4v')  # Change codec
+out = cv2.VideoWriter(output_file, fourcc, fps, (width, height))
+
+# Create a white background for the trace and arms canvases
+trace_canvas = np.ones((height, width, 3), dtype=np.uint8) * 255  # White background for tracing
+arms_canvas = np.ones((height, width, 3), dtype=np.uint8) * 255   # White background for arms
+
+# Global variable to store the line width
+line_width = random.randint(5, 125)  # Initialize with a random value
+
+# Initial position
+initial_x = width // 2
+initial_y = height // 2
+
+# Number of frames of trajectory computed in one vectorized pass
+chunk_frames = 60 * fps  # One minute of frames at a time
+
+# Function to compute every joint of the arm chain for a block of frames in one vectorized pass
+def compute_trajectory(radii, speeds, angles, num_frames, start_frame=0):
+    # Angles come straight from the frame index, so there is no drift from millions of += steps
+    frame_indices = np.arange(start_frame, start_frame + num_frames)
+    arm_angles = angles[np.newaxis, :] + np.outer(frame_indices, speeds)
+
+    # Each arm is a complex exponential scaled by its radius
+    arm_vectors = radii[np.newaxis, :] * np.exp(1j * arm_angles)
+
+    # Truncate each arm like int() in the per-frame loop, then chain the arms with a cumulative sum
+    joints_x = np.empty((num_frames, len(radii) + 1), dtype=np.int64)
+    joints_y = np.empty((num_frames, len(radii) + 1), dtype=np.int64)
+    joints_x[:, 0] = initial_x
+    joints_y[:, 0] = initial_y
+    np.cumsum(np.trunc(arm_vectors.real).astype(np.int64), axis=1, out=joints_x[:, 1:])
+    np.cumsum(np.trunc(arm_vectors.imag).astype(np.int64), axis=1, out=joints_y[:, 1:])
+    joints_x[:, 1:] += initial_x
+    joints_y[:, 1:] += initial_y
+
+    # Column 0 is the centre, the last column is the pen
+    return joints_x, joints_y
+
+frame_count = 0
+minutes = 60*12
+max_frames = minutes * 60 * fps  # Limit to 1 hour of frames
+
+# Pixel tolerance for the closure search when the speeds have no exact period
+closure_tolerance = 2.0
+
+# Function to find the first frame at which the pen comes back to its starting point
+def predict_closure_frame(radii, speeds, angles, max_frames, tolerance=closure_tolerance):
+    # Arms turning at the same speed act as a single arm, and arms that cancel out do not change the period
+    closure_frame = 1
+    phase_errors = []
+    for speed in np.unique(speeds):
+        same_speed = speeds == speed
+        amplitude = np.sum(radii[same_speed] * np.exp(1j * angles[same_speed]))
+        if speed == 0 or abs(amplitude) < 1e-9:
+            continue
+
+        # An arm turning p / q turns per frame is back where it started every q frames
+        turns = speed / (2 * np.pi)
+        fraction = Fraction(turns).limit_denominator(int(max_frames))
+        closure_frame = math.lcm(closure_frame, fraction.denominator)
+        phase_errors.append(abs(float(fraction) - turns) * 2 * np.pi)
+
+    # The period is exact if no arm is off by more than a nanoradian when the curve closes
+    if closure_frame <= max_frames and max(phase_errors, default=0.0) * closure_frame < 1e-9:
+        return closure_frame, True
+
+    # Fall back to searching the trajectory for the first return within the tolerance
+    first_x, first_y = compute_trajectory(radii, speeds, angles, 1)
+    left_start = False  # The pen has to move away before a return counts
+    for start_frame in range(1, int(max_frames) + 1, chunk_frames):
+        num_frames = min(chunk_frames, int(max_frames) + 1 - start_frame)
+        joints_x, joints_y = compute_trajectory(radii, speeds, angles, num_frames, start_frame)
+        distance_squared = (joints_x[:, -1] - first_x[0, -1]) ** 2 + (joints_y[:, -1] - first_y[0, -1]) ** 2
+        near_start = distance_squared <= tolerance ** 2
+
+        # Ignore the frames before the pen first leaves the tolerance around the start
+        if not left_start:
+            away = np.flatnonzero(~near_start)
+            if len(away) == 0:
+                continue
+            near_start[:away[0]] = False
+            left_start = True
+
+        returns = np.flatnonzero(near_start)
+        if len(returns) > 0:
+            return start_frame + int(returns[0]), False
+
+    # The curve does not close within the frame budget
+    return None, False
+
+# Function to reset the drawing conditions and clear the screen
+def reset_drawing_conditions():
+    global trace_canvas, arms_canvas, line_width  # Make sure these variables are accessible and modifiable inside the function
+    N = random.randint(2, 2)
+    angles = np.zeros(N)
+    radii = np.random.uniform(0, height // 3, N) * 1.0
+    denominators = np.array([-8, -7, -6, -5, -4, -3, -2, 2, 3, 4, 5, 6, 7, 8])
+    speeds = np.pi / np.random.choice(denominators, N)/10
+    # Reset the canvases to white
+    trace_canvas[:] = 255  # Clear trace canvas
+    arms_canvas[:] = 255   # Clear arms canvas
+    
+    # Set a new random line width only once when resetting conditions
+    line_width = random.randint(5, 125)
+
+    # Work out up front the frame at which this curve closes
+    closure_frame, exact = predict_closure_frame(radii, speeds, angles, max_frames)
+    if closure_frame is None:
+        print(f"Curve does not close within {max_frames} frames.")
+    elif exact:
+        print(f"Curve closes exactly after {closure_frame} frames.")
+    else:
+        print(f"Curve returns within {closure_tolerance} pixels of its start after {closure_frame} frames.")
+
+    return N, angles, radii, speeds, closure_frame
+
+# Initialize variables for each arm
+N, angles, radii, speeds, closure_frame = reset_drawing_conditions()
+
+# Number of frames advanced by each call to the batched kernel
+batch_frames = 256
+
+# Function to find the first point of a cycle for the kernel's distance test
+def first_pen_point(radii, speeds, angles):
+    joints_x, joints_y = compute_trajectory(radii, speeds, angles, 1)
+    return int(joints_x[0, -1]), int(joints_y[0, -1])
+
+# Function to find the first frame at which the pen is outside the tolerance around its first point
+def first_leave_frame(radii, speeds, angles, first_x, first_y, tolerance=closure_tolerance):
+    for start_frame in range(1, int(max_frames) + 1, chunk_frames):
+        num_frames = min(chunk_frames, int(max_frames) + 1 - start_frame)
+        joints_x, joints_y = compute_trajectory(radii, speeds, angles, num_frames, start_frame)
+        distance_squared = (joints_x[:, -1] - first_x) ** 2 + (joints_y[:, -1] - first_y) ** 2
+        away = np.flatnonzero(distance_squared > tolerance ** 2)
+        if len(away) > 0:
+            return start_frame + int(away[0])
+
+    # The pen never leaves, so the distance test never closes the curve
+    return int(max_frames)
+
+cycle_frame = 0  # Frame index within the current drawing cycle
+path_start = 0   # Cycle frame of the first row of the current batch
+first_x, first_y = first_pen_point(radii, speeds, angles)
+leave_frame = 0 if closure_frame is not None else first_leave_frame(radii, speeds, angles, first_x, first_y)  # Only the distance test reads it
+
+# Variables to store the previous point
+previous_x = None
+previous_y = None
+drawing_started = False  # Flag to avoid drawing the initial line from the center
+
+# Random HSL color for the trace
+hue = np.random.uniform(0, 360)  # Random hue between 0 and 360
+hue_step = 0.5  # Hue change per frame
+saturation = 100  # Fully saturated
+lightness = 50  # Moderate lightness
+
+# Function to run the batched kernel for the current configuration
+def run_kernel_batch(start_frame, hue):
+    return step_frames(start_frame, batch_frames, radii, speeds, angles, initial_x, initial_y, first_x, first_y, leave_frame,
+                       -1 if closure_frame is None else closure_frame, closure_tolerance ** 2,
+                       hue, hue_step, saturation, lightness)
+
+# Run the first batch of the kernel
+joints_x, joints_y, colors, closed_flags, next_hue = run_kernel_batch(0, hue)
+
+# Introduce the random_color parameter
+random_color = random.choice([True, False])
+
+# Start time
+start_time = time.time()
+
+try:
+    while frame_count < max_frames:
+        # Run the kernel for the next batch once the current one is used up
+        if cycle_frame - path_start >= batch_frames:
+            path_start = cycle_frame
+            hue = next_hue
+            joints_x, joints_y, colors, closed_flags, next_hue = run_kernel_batch(path_start, hue)
+
+        # Look up this frame in the kernel output
+        row = cycle_frame - path_start
+        frame_joints_x = joints_x[row].tolist()
+        frame_joints_y = joints_y[row].tolist()
+        trace_color = tuple(colors[row].tolist())
+
+        # Reset the arms canvas to be blank for each frame
+        arms_canvas[:] = 255  # White background
+
+        # Loop through each arm to draw it
+        for j in range(N):
+            arm_start = (frame_joints_x[j], frame_joints_y[j])
+            arm_end = (frame_joints_x[j + 1], frame_joints_y[j + 1])
+
+            # Draw the arm as a line from the previous joint to the next one in black
+            cv2.line(arms_canvas, arm_start, arm_end, (0, 0, 0), 5, cv2.LINE_AA)
+
+            # Draw black circles at each articulation point
+            cv2.circle(arms_canvas, arm_start, 10, (0, 0, 0), -1)  # Black circle at articulation point
+            cv2.circle(arms_canvas, arm_end, 10, (0, 0, 0), -1)  # Black circle at the next articulation point
+
+        # The pen is the end of the last arm
+        x_current = frame_joints_x[N]
+        y_current = frame_joints_y[N]
+
+        # Only draw the line if we have a valid previous point and after the drawing started
+        if drawing_started:
+            # Check the random_color flag to determine whether to draw in black or color
+            if random_color:
+                # Draw in black
+                cv2.line(trace_canvas, (previous_x, previous_y), (x_current, y_current), (0, 0, 0), line_width, cv2.LINE_AA)
+            else:
+                # Use the color-changing logic
+                cv2.line(trace_canvas, (previous_x, previous_y), (x_current, y_current), trace_color, line_width, cv2.LINE_AA)
+
+        # Mark drawing as started after the first valid point
+        if not drawing_started:
+            drawing_started = True
+
+        # Update the previous point to the current point
+        previous_x = x_current
+        previous_y = y_current
+
+        # Normalize the trace canvas and arms canvas to range [0, 1] for multiplication
+        trace_canvas_normalized = trace_canvas.astype(np.float32) / 255.0
+        arms_canvas_normalized = arms_canvas.astype(np.float32) / 255.0
+
+        # Multiply the two canvases (element-wise)
+        multiplied_frame = trace_canvas_normalized * arms_canvas_normalized
+
+        # Rescale back to [0, 255] and convert to uint8
+        final_frame = (multiplied_frame * 255).astype(np.uint8)
+
+        # Write the combined frame to the video
+        out.write(final_frame)
+
+        frame_count += 1
+        cycle_frame += 1
+
+        # End the cycle on the frame the kernel flags as closing the curve
+        if closed_flags[row]:
+            print(f"Curve closed after {cycle_frame - 1} frames, restarting conditions.")
+            # Reset the drawing conditions and continue
+            N, angles, radii, speeds, closure_frame = reset_drawing_conditions()
+            previous_x, previous_y = None, None
+            drawing_started = False
+            cycle_frame = 0
+            path_start = 0
+            first_x, first_y = first_pen_point(radii, speeds, angles)
+            leave_frame = 0 if closure_frame is not None else first_leave_frame(radii, speeds, angles, first_x, first_y)
+
+            # The hue carries on from the frame after the one just drawn
+            hue = (hue + hue_step * (row + 1)) % 360
+            joints_x, joints_y, colors, closed_flags, next_hue = run_kernel_batch(0, hue)
+
+        # Print statistics every 1000 frames
+        if frame_count % 1000 == 0:
+            elapsed_time = time.time() - start_time
+            progress = frame_count / max_frames * 100
+            estimated_total_time = elapsed_time / (frame_count / max_frames)
+            estimated_end_time = start_time + estimated_total_time
+            remaining_time = estimated_end_time - time.time()
+
+            print(f"Frame {frame_count}/{max_frames} - Progress: {progress:.2f}%")
+            print(f"Elapsed Time: {elapsed_time:.2f} seconds")
+            print(f"Estimated Total Time: {estimated_total_time:.2f} seconds")
+            print(f"Estimated Time Remaining: {remaining_time:.2f} seconds")
+
+        # Check if the user pressed the 'q' key to exit early
+        if cv2.waitKey(1) & 0xFF == ord('q'):
+            break
+finally:
+    # Ensure the video writer and window are closed properly
+    out.release()
+    print(f"Video saved as {output_file}")
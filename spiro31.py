@@ -0,0 +1,294 @@
+import cv2
+import numpy as np
+import math
+import time
+import os
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+# Function to convert HSL to RGB
+def hsl_to_rgb(h, s, l):
+    h = float(h)
+    s = float(s) / 100.0
+    l = float(l) / 100.0
+    c = (1.0 - abs(2.0 * l - 1.0)) * s
+    x = c * (1.0 - abs((h / 60.0) % 2.0 - 1.0))
+    m = l - c / 2.0
+    r, g, b = 0, 0, 0
+
+    if 0 <= h < 60:
+        r, g, b = c, x, 0
+    elif 60 <= h < 120:
+        r, g, b = x, c, 0
+    elif 120 <= h < 180:
+        r, g, b = 0, c, x
+    elif 180 <= h < 240:
+        r, g, b = 0, x, c
+    elif 240 <= h < 300:
+        r, g, b = x, 0, c
+    elif 300 <= h < 360:
+        r, g, b = c, 0, x
+
+    r = int((r + m) * 255)
+    g = int((g + m) * 255)
+    b = int((b + m) * 255)
+    return (r, g, b)
+
+# Create 'videos' folder if it doesn't exist
+if not os.path.exists('videos'):
+    os.makedirs('videos')
+
+# Get the current epoch time for the video filename
+epoch_time = int(time.time())
+output_file = os.path.join('videos', f'output_video_{epoch_time}.mp4')
+
+# Video configuration
+width = 1920  # Resolution
+height = 1080
+fps = 60  # Lower FPS
+fourcc = cv2.VideoWriter_fourcc(*'mp4v')  # Change codec
+out = cv2.VideoWriter(output_file, fourcc, fps, (width, height))
+
+# Create a white background for the trace and arms canvases
+trace_canvas = np.ones((height, width, 3), dtype=np.uint8) * 255  # White background for tracing
+arms_canvas = np.ones((height, width, 3), dtype=np.uint8) * 255   # White background for arms
+
+# Global variable to store the line width
+line_width = random.randint(5, 125)  # Initialize with a random value
+
+# Function to reset the drawing conditions and clear the screen
+def reset_drawing_conditions():
+    global trace_canvas, arms_canvas, line_width
+    N = random.randint(2, 2)
+    angles = np.zeros(N)
+    radii = np.random.uniform(0, height // 3, N) * 1.0
+    denominators = np.array([-8, -7, -6, -5, -4, -3, -2, 2, 3, 4, 5, 6, 7, 8])
+    speeds = np.pi / np.random.choice(denominators, N)/10
+    # Reset the canvases to white
+    trace_canvas[:] = 255  # Clear trace canvas
+    arms_canvas[:] = 255   # Clear arms canvas
+    
+    # Set a new random line width only once when resetting conditions
+    line_width = random.randint(5, 125)
+
+    return N, angles, radii, speeds
+
+# Initialize variables for each arm
+N, angles, radii, speeds = reset_drawing_conditions()
+
+# Initial position
+initial_x = width // 2
+initial_y = height // 2
+
+# Variables to store the previous point
+previous_x = None
+previous_y = None
+drawing_started = False  # Flag to avoid drawing the initial line from the center
+first_x, first_y = None, None  # To capture the first point drawn
+
+frame_count = 0
+minutes = 1
+max_frames = minutes * 60 * fps  # Limit to 1 hour of frames
+
+# Random HSL color for the trace
+hue = np.random.uniform(0, 360)  # Random hue between 0 and 360
+saturation = 100  # Fully saturated
+lightness = 50  # Moderate lightness
+trace_color = hsl_to_rgb(hue, saturation, lightness)
+
+# Introduce the random_color parameter
+random_color = random.choice([True, False])
+
+# Start time
+start_time = time.time()
+
+# Function to compute arm positions (parallelized), kept for the benchmark below
+def compute_arm_position(index, angle, radius, x_current, y_current):
+    cos_angle = math.cos(angle)
+    sin_angle = math.sin(angle)
+    new_x = x_current + int(cos_angle * radius)
+    new_y = y_current + int(sin_angle * radius)
+    return new_x, new_y
+
+# Function to compute every chained joint of one frame in a single cumulative sum
+def solve_joints(angles, radii, x_start, y_start):
+    joints_x = np.empty(len(radii) + 1, dtype=np.int64)
+    joints_y = np.empty(len(radii) + 1, dtype=np.int64)
+    joints_x[0] = x_start
+    joints_y[0] = y_start
+    # Truncate each arm like int() does, then chain the arms from the start point
+    np.cumsum(np.trunc(np.cos(angles) * radii).astype(np.int64), out=joints_x[1:])
+    np.cumsum(np.trunc(np.sin(angles) * radii).astype(np.int64), out=joints_y[1:])
+    joints_x[1:] += x_start
+    joints_y[1:] += y_start
+    return joints_x, joints_y
+
+# Function to compute the chained joints of a batch of frames in one pass
+def solve_joints_batch(radii, speeds, angles, start_frame, num_frames, x_start, y_start):
+    # Angles come from the frame index, so batches can be computed out of order
+    angle_rows = angles + np.outer(np.arange(start_frame, start_frame + num_frames), speeds)
+    joints_x = np.empty((num_frames, len(radii) + 1), dtype=np.int64)
+    joints_y = np.empty((num_frames, len(radii) + 1), dtype=np.int64)
+    joints_x[:, 0] = x_start
+    joints_y[:, 0] = y_start
+    np.cumsum(np.trunc(np.cos(angle_rows) * radii).astype(np.int64), axis=1, out=joints_x[:, 1:])
+    np.cumsum(np.trunc(np.sin(angle_rows) * radii).astype(np.int64), axis=1, out=joints_y[:, 1:])
+    joints_x[:, 1:] += x_start
+    joints_y[:, 1:] += y_start
+    return joints_x, joints_y
+
+# Benchmark settings for the joint solvers
+run_benchmark = False  # Set to True to time the joint solvers before rendering
+benchmark_arm_counts = [2, 4, 16, 256]
+benchmark_frames = 200
+
+# Function to print the per-frame cost of each way of computing the joints
+def benchmark_joint_solvers():
+    print("Per-frame joint solver cost:")
+    for arm_count in benchmark_arm_counts:
+        bench_angles = np.random.uniform(0, 2 * np.pi, arm_count)
+        bench_radii = np.random.uniform(0, height // 3, arm_count)
+        bench_speeds = np.pi / np.random.choice([-8, -5, -3, 2, 4, 7], arm_count) / 10
+
+        # Before: a new thread pool per frame mapping compute_arm_position over the arms
+        t0 = time.perf_counter()
+        for _ in range(benchmark_frames):
+            with ThreadPoolExecutor() as pool:
+                list(pool.map(compute_arm_position, range(arm_count), bench_angles, bench_radii,
+                                  [initial_x] * arm_count, [initial_y] * arm_count))
+        pool_time = (time.perf_counter() - t0) / benchmark_frames
+
+        # After: one cumulative sum per frame
+        t0 = time.perf_counter()
+        for _ in range(benchmark_frames):
+            solve_joints(bench_angles, bench_radii, initial_x, initial_y)
+        cumsum_time = (time.perf_counter() - t0) / benchmark_frames
+
+        # After, batched: one cumulative sum for the whole block of frames
+        t0 = time.perf_counter()
+        solve_joints_batch(bench_radii, bench_speeds, bench_angles, 0, benchmark_frames, initial_x, initial_y)
+        batch_time = (time.perf_counter() - t0) / benchmark_frames
+
+        print(f"  N={arm_count}: thread pool {pool_time * 1e6:.1f} us, "
+              f"cumulative sum {cumsum_time * 1e6:.1f} us, batched {batch_time * 1e6:.2f} us")
+
+if run_benchmark:
+    benchmark_joint_solvers()
+
+# Number of frames solved per batch, the next batch is solved on a worker thread while this one is drawn
+batch_frames = 256
+executor = ThreadPoolExecutor(max_workers=1)  # Created once for the whole run
+
+# Function to queue the joints of the next batch of frames on the worker thread
+def submit_batch(start_frame):
+    return executor.submit(solve_joints_batch, radii, speeds, angles, start_frame, batch_frames, initial_x, initial_y)
+
+cycle_frame = 0  # Frame index within the current drawing cycle
+batch_start = 0  # Cycle frame of the first row of the current batch
+joints_x, joints_y = submit_batch(0).result()
+next_batch = submit_batch(batch_frames)
+
+try:
+    while frame_count < max_frames:
+        # Move on to the batch solved in the background once the current one is used up
+        if cycle_frame - batch_start >= batch_frames:
+            batch_start = cycle_frame
+            joints_x, joints_y = next_batch.result()
+            next_batch = submit_batch(batch_start + batch_frames)
+
+        # Look up the chained joints for this frame
+        row = cycle_frame - batch_start
+        frame_joints_x = joints_x[row].tolist()
+        frame_joints_y = joints_y[row].tolist()
+
+        # Reset the arms canvas to be blank for each frame
+        arms_canvas[:] = 255  # White background
+
+        for j in range(N):
+            arm_start = (frame_joints_x[j], frame_joints_y[j])
+            arm_end = (frame_joints_x[j + 1], frame_joints_y[j + 1])
+
+            # Draw the arm as a line from the previous joint to the next one in black
+            cv2.line(arms_canvas, arm_start, arm_end, (0, 0, 0), 5, cv2.LINE_AA)
+
+            # Draw black circles at each articulation point
+            cv2.circle(arms_canvas, arm_start, 10, (0, 0, 0), -1)  # Black circle at articulation point
+            cv2.circle(arms_canvas, arm_end, 10, (0, 0, 0), -1)  # Black circle at the next articulation point
+
+        # The pen is the end of the last arm
+        x_current = frame_joints_x[N]
+        y_current = frame_joints_y[N]
+
+        # Capture the first point
+        if drawing_started and first_x is None and first_y is None:
+            first_x, first_y = previous_x, previous_y
+
+        # Only draw the line if we have a valid previous point and after the drawing started
+        if drawing_started:
+            # Check the random_color flag to determine whether to draw in black or color
+            if random_color:
+                # Draw in black
+                cv2.line(trace_canvas, (previous_x, previous_y), (x_current, y_current), (0, 0, 0), line_width, cv2.LINE_AA)
+            else:
+                # Use the color-changing logic
+                cv2.line(trace_canvas, (previous_x, previous_y), (x_current, y_current), trace_color, line_width, cv2.LINE_AA)
+
+        # Mark drawing as started after the first valid point
+        if not drawing_started:
+            drawing_started = True
+
+        # Update the previous point to the current point
+        previous_x = x_current
+        previous_y = y_current
+
+        # Multiply the two canvases
+        final_frame = cv2.multiply(trace_canvas, arms_canvas, scale=1/255.0).astype(np.uint8)
+
+        # Write the combined frame to the video
+        out.write(final_frame)
+
+        frame_count += 1
+        cycle_frame += 1
+
+        # Gradually change the hue (for example, by 0.5 per frame)
+        hue = (hue + 0.5) % 360
+        trace_color = hsl_to_rgb(hue, saturation, lightness)
+
+        # Check if the current point is within 5 pixels of the first point using squared distance
+        if first_x is not None and first_y is not None:
+            distance_squared = (x_current - first_x) ** 2 + (y_current - first_y) ** 2
+            if distance_squared <= 4:
+                print(f"Current point is within 5 pixels of the first point, restarting conditions.")
+                # Reset the drawing conditions and continue
+                N, angles, radii, speeds = reset_drawing_conditions()
+                previous_x, previous_y = None, None
+                drawing_started = False
+                first_x, first_y = None, None
+                next_batch.cancel()
+                cycle_frame = 0
+                batch_start = 0
+                joints_x, joints_y = submit_batch(0).result()
+                next_batch = submit_batch(batch_frames)
+
+        # Print statistics every 1000 frames
+        if frame_count % 1000 == 0:
+            elapsed_time = time.time() - start_time
+            progress = frame_count / max_frames * 100
+            estimated_total_time = elapsed_time / (frame_count / max_frames)
+            estimated_end_time = start_time + estimated_total_time
+            remaining_time = estimated_end_time - time.time()
+
+            print(f"Frame {frame_count}/{max_frames} - Progress: {progress:.2f}%")
+            print(f"Elapsed Time: {elapsed_time:.2f} seconds")
+            print(f"Estimated Total Time: {estimated_total_time:.2f} seconds")
+            print(f"Estimated Time Remaining: {remaining_time:.2f} seconds")
+
+        # Check if the user pressed the 'q' key to exit early
+        if cv2.waitKey(1) & 0xFF == ord('q'):
+            break
+finally:
+    # Ensure the video writer and window are closed properly
+    out.release()
+    executor.shutdown()
+    print(f"Video saved as {output_file}")
+
@@ -0,0 +1,126 @@
+import numpy as np
+import time
+import os
+import csv
+
+# Create 'configs' folder if it doesn't exist
+if not os.path.exists('configs'):
+    os.makedirs('configs')
+
+# Get the current epoch time for the results filename
+epoch_time = int(time.time())
+output_file = os.path.join('configs', f'screening_{epoch_time}.csv')
+
+# Canvas the configurations are screened for
+width = 1920  # Resolution
+height = 1080
+fps = 60
+
+# Screening configuration
+num_configurations = 10000  # Configurations sampled and simulated at once
+min_arms = 2
+max_arms = 4  # Every configuration is padded to this many arms
+denominators = np.array([-8, -7, -6, -5, -4, -3, -2, 2, 3, 4, 5, 6, 7, 8])
+chunk_frames = 128  # Frames simulated per vectorized pass, bounds memory at M * chunk_frames * max_arms
+num_best = 10  # Configurations listed at the end
+
+# Initial position
+initial_x = width // 2
+initial_y = height // 2
+
+# Function to sample many configurations at once as (M, N) arrays
+def sample_configurations(num_configurations):
+    # Mixed arm counts are padded to max_arms, the padding arms have zero radius and zero speed
+    arm_counts = np.random.randint(min_arms, max_arms + 1, num_configurations)
+    arm_mask = np.arange(max_arms)[np.newaxis, :] < arm_counts[:, np.newaxis]
+
+    angles = np.zeros((num_configurations, max_arms))
+    radii = np.random.uniform(0, height // 3, (num_configurations, max_arms)) * 1.0 * arm_mask
+    chosen_denominators = np.where(arm_mask, np.random.choice(denominators, (num_configurations, max_arms)), 0)
+    speeds = np.divide(np.pi, chosen_denominators * 10, out=np.zeros((num_configurations, max_arms)),
+                       where=arm_mask)
+    line_widths = np.random.randint(5, 126, num_configurations)
+
+    return arm_counts, arm_mask, angles, radii, chosen_denominators, speeds, line_widths
+
+# Function to compute the closure period of every configuration from its denominators
+def compute_periods(chosen_denominators, arm_mask):
+    # An arm turning pi / (10 * d) per frame is back where it started every 20 * |d| frames
+    arm_periods = np.where(arm_mask, 20 * np.abs(chosen_denominators), 1)
+    return np.lcm.reduce(arm_periods, axis=1)
+
+# Function to compute the pen positions of all configurations for a block of frames in one vectorized pass
+def compute_trajectories(radii, speeds, angles, start_frame, num_frames):
+    frame_indices = np.arange(start_frame, start_frame + num_frames)
+    arm_angles = angles[:, np.newaxis, :] + speeds[:, np.newaxis, :] * frame_indices[np.newaxis, :, np.newaxis]
+    # Padding arms have zero radius, so they add nothing to the sum
+    pen = np.sum(radii[:, np.newaxis, :] * np.exp(1j * arm_angles), axis=2)
+    return pen + complex(initial_x, initial_y)  # Shape (M, num_frames)
+
+# Function to compute bounding box and path length of every configuration over its own period
+def compute_statistics(radii, speeds, angles, periods):
+    num_configurations = len(periods)
+    x_min = np.full(num_configurations, np.inf)
+    x_max = np.full(num_configurations, -np.inf)
+    y_min = np.full(num_configurations, np.inf)
+    y_max = np.full(num_configurations, -np.inf)
+    path_length = np.zeros(num_configurations)
+    previous_point = compute_trajectories(radii, speeds, angles, 0, 1)[:, 0]
+
+    for start_frame in range(0, int(periods.max()) + 1, chunk_frames):
+        # Only simulate the configurations that have not closed yet
+        active = np.flatnonzero(periods >= start_frame)
+        pen = compute_trajectories(radii[active], speeds[active], angles[active], start_frame, chunk_frames)
+
+        # Frames past each configuration's own period are masked out
+        in_period = start_frame + np.arange(chunk_frames)[np.newaxis, :] <= periods[active, np.newaxis]
+        x_min[active] = np.minimum(x_min[active], np.where(in_period, pen.real, np.inf).min(axis=1))
+        x_max[active] = np.maximum(x_max[active], np.where(in_period, pen.real, -np.inf).max(axis=1))
+        y_min[active] = np.minimum(y_min[active], np.where(in_period, pen.imag, np.inf).min(axis=1))
+        y_max[active] = np.maximum(y_max[active], np.where(in_period, pen.imag, -np.inf).max(axis=1))
+
+        # Segment lengths, including the one joining the previous block to this one
+        segments = np.abs(np.diff(np.hstack([previous_point[active, np.newaxis], pen]), axis=1))
+        path_length[active] += np.sum(np.where(in_period, segments, 0), axis=1)
+        previous_point[active] = pen[:, -1]
+
+    return x_min, x_max, y_min, y_max, path_length
+
+# Start time
+start_time = time.time()
+
+arm_counts, arm_mask, angles, radii, chosen_denominators, speeds, line_widths = sample_configurations(num_configurations)
+periods = compute_periods(chosen_denominators, arm_mask)
+x_min, x_max, y_min, y_max, path_length = compute_statistics(radii, speeds, angles, periods)
+
+# Share of the curve's bounding box that lands on the canvas
+box_area = np.maximum((x_max - x_min) * (y_max - y_min), 1.0)
+visible_area = (np.clip(x_max, 0, width) - np.clip(x_min, 0, width)) * (np.clip(y_max, 0, height) - np.clip(y_min, 0, height))
+on_canvas = visible_area / box_area
+
+elapsed_time = time.time() - start_time
+print(f"Screened {num_configurations} configurations in {elapsed_time:.2f} seconds")
+print(f"Period: min {periods.min()} frames, median {int(np.median(periods))} frames, max {periods.max()} frames")
+print(f"Fully on canvas: {np.count_nonzero(on_canvas >= 1.0)} of {num_configurations}")
+
+# Write every configuration and its statistics so any of them can be rendered later
+with open(output_file, 'w', newline='') as csv_file:
+    writer = csv.writer(csv_file)
+    writer.writerow(['index', 'N'] + [f'radius_{j}' for j in range(max_arms)] + [f'denominator_{j}' for j in range(max_arms)]
+                    + ['line_width', 'period_frames', 'period_seconds', 'x_min', 'x_max', 'y_min', 'y_max',
+                       'path_length', 'on_canvas'])
+    for i in range(num_configurations):
+        writer.writerow([i, arm_counts[i]] + [f'{r:.3f}' for r in radii[i]] + list(chosen_denominators[i])
+                        + [line_widths[i], periods[i], f'{periods[i] / fps:.2f}', f'{x_min[i]:.1f}', f'{x_max[i]:.1f}',
+                           f'{y_min[i]:.1f}', f'{y_max[i]:.1f}', f'{path_length[i]:.1f}', f'{on_canvas[i]:.3f}'])
+
+# List the longest paths that fit entirely on the canvas
+candidates = np.flatnonzero(on_canvas >= 1.0)
+best = candidates[np.argsort(path_length[candidates])[::-1][:num_best]]
+print(f"Longest fully visible paths:")
+for i in best:
+    print(f"  #{i}: N={arm_counts[i]}, radii={np.round(radii[i, :arm_counts[i]], 1).tolist()}, "
+          f"denominators={chosen_denominators[i, :arm_counts[i]].tolist()}, period={periods[i]} frames, "
+          f"path length={path_length[i]:.0f} pixels")
+
+print(f"Results saved as {output_file}")
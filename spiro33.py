@@ -0,0 +1,282 @@
+import cv2
+import numpy as np
+import math
+import cmath
+import time
+import os
+import random
+
+# Function to convert HSL to RGB
+def hsl_to_rgb(h, s, l):
+    h = float(h)
+    s = float(s) / 100.0
+    l = float(l) / 100.0
+    c = (1.0 - abs(2.0 * l - 1.0)) * s
+    x = c * (1.0 - abs((h / 60.0) % 2.0 - 1.0))
+    m = l - c / 2.0
+    r, g, b = 0, 0, 0
+
+    if 0 <= h < 60:
+        r, g, b = c, x, 0
+    elif 60 <= h < 120:
+        r, g, b = x, c, 0
+    elif 120 <= h < 180:
+        r, g, b = 0, c, x
+    elif 180 <= h < 240:
+        r, g, b = 0, x, c
+    elif 240 <= h < 300:
+        r, g, b = x, 0, c
+    elif 300 <= h < 360:
+        r, g, b = c, 0, x
+
+    r = int((r + m) * 255)
+    g = int((g + m) * 255)
+    b = int((b + m) * 255)
+    return (r, g, b)
+
+# Create 'videos' folder if it doesn't exist
+if not os.path.exists('videos'):
+    os.makedirs('videos')
+
+# Get the current epoch time for the video filename
+epoch_time = int(time.time())
+output_file = os.path.join('videos', f'output_video_{epoch_time}.mp4')
+
+# Video configuration
+width = 1920  # Resolution
+height = 1080
+fps = 60  # Lower FPS
+fourcc = cv2.VideoWriter_fourcc(*'mp4v')  # Change codec
+out = cv2.VideoWriter(output_file, fourcc, fps, (width, height))
+
+# Create a white background for the trace and arms canvases
+trace_canvas = np.ones((height, width, 3), dtype=np.uint8) * 255  # White background for tracing
+arms_canvas = np.ones((height, width, 3), dtype=np.uint8) * 255   # White background for arms
+
+# Global variable to store the line width
+line_width = random.randint(5, 125)  # Initialize with a random value
+
+# Initial position
+initial_x = width // 2
+initial_y = height // 2
+
+frame_count = 0
+minutes = 60
+max_frames = minutes * 60 * fps  # Limit to 1 hour of frames
+
+# Near-return detector settings
+return_tolerance = 2.0  # Pixels, also the size of a grid cell
+match_joint_state = True  # Require every joint to come back, not just the pen
+
+# Function to find the fewest frames after which the arms can all be back where they were
+def compute_min_return_gap(radii, speeds):
+    # An arm longer than the tolerance only comes back after nearly a full turn
+    min_return_gap = 1
+    for j in range(len(radii)):
+        if radii[j] > return_tolerance and speeds[j] != 0:
+            turn = 2 * np.pi - 2 * math.asin(return_tolerance / (2 * radii[j]))
+            min_return_gap = max(min_return_gap, int(turn / abs(speeds[j])))
+    return min_return_gap
+
+# Function to record a state in the grid and report the earlier frame it comes back to, if any
+def find_near_return(visited_cells, frame_index, joints, min_return_gap):
+    pen = joints[-1]
+    cell_x = int(pen.real // return_tolerance)
+    cell_y = int(pen.imag // return_tolerance)
+
+    # Anything within the tolerance of the pen lies in this cell or one of its neighbours
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            for earlier_frame, earlier_joints in visited_cells.get((cell_x + dx, cell_y + dy), ()):
+                if frame_index - earlier_frame < min_return_gap:
+                    continue
+                if match_joint_state:
+                    returned = all(abs(joints[j] - earlier_joints[j]) <= return_tolerance for j in range(len(joints)))
+                else:
+                    returned = abs(pen - earlier_joints[-1]) <= return_tolerance
+                if returned:
+                    return earlier_frame
+
+    visited_cells.setdefault((cell_x, cell_y), []).append((frame_index, joints))
+    return None
+
+# Function to reset the drawing conditions and clear the screen
+def reset_drawing_conditions():
+    global trace_canvas, arms_canvas, line_width  # Make sure these variables are accessible and modifiable inside the function
+    N = random.randint(2, 4)
+    angles = np.zeros(N)
+    radii = np.random.uniform(0, height // 4, N) * 1.5
+    speeds = np.random.uniform(-0.5, 0.5, N) / 20
+    # Reset the canvases to white
+    trace_canvas[:] = 255  # Clear trace canvas
+    arms_canvas[:] = 255   # Clear arms canvas
+    
+    # Set a new random line width only once when resetting conditions
+    line_width = random.randint(5, 125)
+
+    # Start a fresh grid of visited states for this curve
+    visited_cells = {}
+    min_return_gap = compute_min_return_gap(radii, speeds)
+
+    return N, angles, radii, speeds, visited_cells, min_return_gap
+
+# How the streaming rotors are kept on the exact circle: 'reanchor' or 'renormalize'
+drift_correction = 'reanchor'
+correction_every = 1000  # Frames between corrections
+
+# Function to set each arm rotor to its exact position at a given frame
+def anchor_rotors(radii, speeds, angles, frame_index):
+    return [radii[j] * cmath.exp(1j * (angles[j] + speeds[j] * frame_index)) for j in range(len(radii))]
+
+# Function to compute the constant complex factor that turns each arm by one frame
+def compute_step_factors(speeds):
+    return [cmath.exp(1j * speeds[j]) for j in range(len(speeds))]
+
+# Function to advance every arm by one frame with a complex multiply, no trig needed
+def advance_rotors(rotors, step_factors):
+    for j in range(len(rotors)):
+        rotors[j] *= step_factors[j]
+
+# Function to pull each rotor back to its radius without touching its angle
+def renormalize_rotors(rotors, radii):
+    for j in range(len(rotors)):
+        rotors[j] *= radii[j] / abs(rotors[j])
+
+# Function to apply the drift correction due at a given frame of the cycle
+def correct_rotors(rotors, radii, speeds, angles, frame_index):
+    if frame_index == 0 or drift_correction == 'reanchor':
+        return anchor_rotors(radii, speeds, angles, frame_index)
+    renormalize_rotors(rotors, radii)
+    return rotors
+
+# Initialize variables for each arm
+N, angles, radii, speeds, visited_cells, min_return_gap = reset_drawing_conditions()
+
+# Set up the streaming rotors for the first cycle
+cycle_frame = 0  # Frame index within the current drawing cycle
+rotors = anchor_rotors(radii, speeds, angles, 0)
+step_factors = compute_step_factors(speeds)
+
+# Variables to store the previous point
+previous_x = None
+previous_y = None
+drawing_started = False  # Flag to avoid drawing the initial line from the center
+
+# Random HSL color for the trace
+hue = np.random.uniform(0, 360)  # Random hue between 0 and 360
+saturation = 100  # Fully saturated
+lightness = 50  # Moderate lightness
+trace_color = hsl_to_rgb(hue, saturation, lightness)
+
+# Introduce the random_color parameter
+random_color = random.choice([True, False])
+
+# Start time
+start_time = time.time()
+
+try:
+    while frame_count < max_frames:
+        # Keep the rotors from drifting over millions of frames
+        if cycle_frame % correction_every == 0:
+            rotors = correct_rotors(rotors, radii, speeds, angles, cycle_frame)
+
+        x_current = initial_x
+        y_current = initial_y
+        joint = complex(initial_x, initial_y)  # Unrounded joint position for the detector
+        joints = [joint]
+
+        # Reset the arms canvas to be blank for each frame
+        arms_canvas[:] = 255  # White background
+
+        # Loop through each arm to calculate the position
+        for j in range(N):
+            # The rotor already holds the radius times the cosine and sine of the angle
+            new_x = x_current + int(rotors[j].real)
+            new_y = y_current + int(rotors[j].imag)
+
+            # Draw the arm as a line from (x_current, y_current) to (new_x, new_y) in black
+            cv2.line(arms_canvas, (x_current, y_current), (new_x, new_y), (0, 0, 0), 5, cv2.LINE_AA)
+
+            # Draw black circles at each articulation point
+            cv2.circle(arms_canvas, (x_current, y_current), 10, (0, 0, 0), -1)  # Black circle at articulation point
+            cv2.circle(arms_canvas, (new_x, new_y), 10, (0, 0, 0), -1)  # Black circle at the next articulation point
+
+            # Update current x and y to new_x and new_y
+            x_current, y_current = new_x, new_y
+            joint += rotors[j]
+            joints.append(joint)
+
+        # Turn every arm by one frame
+        advance_rotors(rotors, step_factors)
+
+        # Only draw the line if we have a valid previous point and after the drawing started
+        if drawing_started:
+            # Check the random_color flag to determine whether to draw in black or color
+            if random_color:
+                # Draw in black
+                cv2.line(trace_canvas, (previous_x, previous_y), (x_current, y_current), (0, 0, 0), line_width, cv2.LINE_AA)
+            else:
+                # Use the color-changing logic
+                cv2.line(trace_canvas, (previous_x, previous_y), (x_current, y_current), trace_color, line_width, cv2.LINE_AA)
+
+        # Mark drawing as started after the first valid point
+        if not drawing_started:
+            drawing_started = True
+
+        # Update the previous point to the current point
+        previous_x = x_current
+        previous_y = y_current
+
+        # Normalize the trace canvas and arms canvas to range [0, 1] for multiplication
+        trace_canvas_normalized = trace_canvas.astype(np.float32) / 255.0
+        arms_canvas_normalized = arms_canvas.astype(np.float32) / 255.0
+
+        # Multiply the two canvases (element-wise)
+        multiplied_frame = trace_canvas_normalized * arms_canvas_normalized
+
+        # Rescale back to [0, 255] and convert to uint8
+        final_frame = (multiplied_frame * 255).astype(np.uint8)
+
+        # Write the combined frame to the video
+        out.write(final_frame)
+
+        frame_count += 1
+
+        # Gradually change the hue (for example, by 0.5 per frame)
+        hue = (hue + 0.5) % 360
+        trace_color = hsl_to_rgb(hue, saturation, lightness)
+
+        # Stop spending frames on a curve that only retraces itself
+        returned_to = find_near_return(visited_cells, cycle_frame, joints, min_return_gap)
+        if returned_to is not None:
+            print(f"Frame {cycle_frame} comes back to frame {returned_to} within {return_tolerance} pixels, restarting conditions.")
+            # Reset the drawing conditions and continue
+            N, angles, radii, speeds, visited_cells, min_return_gap = reset_drawing_conditions()
+            previous_x, previous_y = None, None
+            drawing_started = False
+            cycle_frame = 0
+            rotors = anchor_rotors(radii, speeds, angles, 0)
+            step_factors = compute_step_factors(speeds)
+        else:
+            cycle_frame += 1
+
+        # Print statistics every 1000 frames
+        if frame_count % 1000 == 0:
+            elapsed_time = time.time() - start_time
+            progress = frame_count / max_frames * 100
+            estimated_total_time = elapsed_time / (frame_count / max_frames)
+            estimated_end_time = start_time + estimated_total_time
+            remaining_time = estimated_end_time - time.time()
+
+            print(f"Frame {frame_count}/{max_frames} - Progress: {progress:.2f}%")
+            print(f"Elapsed Time: {elapsed_time:.2f} seconds")
+            print(f"Estimated Total Time: {estimated_total_time:.2f} seconds")
+            print(f"Estimated Time Remaining: {remaining_time:.2f} seconds")
+
+        # Check if the user pressed the 'q' key to exit early
+        if cv2.waitKey(1) & 0xFF == ord('q'):
+            break
+finally:
+    # Ensure the video writer and window are closed properly
+    out.release()
+    print(f"Video saved as {output_file}")
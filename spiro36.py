@@ -0,0 +1,312 @@
+import cv2
+import numpy as np
+import math
+import time
+import os
+import random
+from fractions import Fraction
+
+# Function to convert HSL to RGB
+def hsl_to_rgb(h, s, l):
+    h = float(h)
+    s = float(s) / 100.0
+    l = float(l) / 100.0
+    c = (1.0 - abs(2.0 * l - 1.0)) * s
+    x = c * (1.0 - abs((h / 60.0) % 2.0 - 1.0))
+    m = l - c / 2.0
+    r, g, b = 0, 0, 0
+
+    if 0 <= h < 60:
+        r, g, b = c, x, 0
+    elif 60 <= h < 120:
+        r, g, b = x, c, 0
+    elif 120 <= h < 180:
+        r, g, b = 0, c, x
+    elif 180 <= h < 240:
+        r, g, b = 0, x, c
+    elif 240 <= h < 300:
+        r, g, b = x, 0, c
+    elif 300 <= h < 360:
+        r, g, b = c, 0, x
+
+    r = int((r + m) * 255)
+    g = int((g + m) * 255)
+    b = int((b + m) * 255)
+    return (r, g, b)
+
+# Create 'videos' folder if it doesn't exist
+if not os.path.exists('videos'):
+    os.makedirs('videos')
+
+# Get the current epoch time for the video filename
+epoch_time = int(time.time())
+output_file = os.path.join('videos', f'output_video_{epoch_time}.mp4')
+
+# Video configuration
+width = 1920  # Resolution
+height = 1080
+fps = 60  # Lower FPS
+fourcc = cv2.VideoWriter_fourcc(*'mp4v')  # Change codec
+out = cv2.VideoWriter(output_file, fourcc, fps, (width, height))
+
+# Create a white background for the trace and arms canvases
+trace_canvas = np.ones((height, width, 3), dtype=np.uint8) * 255  # White background for tracing
+arms_canvas = np.ones((height, width, 3), dtype=np.uint8) * 255   # White background for arms
+
+# Global variable to store the line width
+line_width = random.randint(5, 125)  # Initialize with a random value
+
+# Initial position
+initial_x = width // 2
+initial_y = height // 2
+
+# Epicycle configuration
+num_arms = 1000  # Rotating terms in the chain
+draw_largest_arms = 16  # Only the largest arms get full-width lines and joint circles, None draws them all
+joint_radius = 10  # Radius of the articulation circles
+chunk_elements = 2000000  # Joint positions computed per vectorized pass, bounds memory for any N
+chunk_frames = max(1, chunk_elements // (num_arms + 1))  # Frames per block of the trajectory
+
+# Function to compute every joint of the arm chain for a block of frames in one vectorized pass
+def compute_trajectory(radii, speeds, angles, num_frames, start_frame=0):
+    # Angles come straight from the frame index, so there is no drift from millions of += steps
+    frame_indices = np.arange(start_frame, start_frame + num_frames)
+    arm_angles = angles[np.newaxis, :] + np.outer(frame_indices, speeds)
+
+    # Chain the unrounded arms and round once, truncating thousands of small arms would add up
+    joints = np.zeros((num_frames, len(radii) + 1), dtype=complex)
+    np.cumsum(radii[np.newaxis, :] * np.exp(1j * arm_angles), axis=1, out=joints[:, 1:])
+    joints_x = np.rint(joints.real).astype(np.int32) + initial_x
+    joints_y = np.rint(joints.imag).astype(np.int32) + initial_y
+
+    # Column 0 is the centre, the last column is the pen
+    return joints_x, joints_y
+
+# Function to find the pixel offsets that cv2.circle fills for a joint, so every joint can be stamped at once
+def compute_disc_offsets(radius):
+    sprite = np.zeros((2 * radius + 1, 2 * radius + 1), dtype=np.uint8)
+    cv2.circle(sprite, (radius, radius), radius, 255, -1)
+    disc_y, disc_x = np.nonzero(sprite)
+    return disc_y - radius, disc_x - radius
+
+disc_offsets_y, disc_offsets_x = compute_disc_offsets(joint_radius)
+
+# Function to draw the whole arm chain with one polyline and one batched stamp of the joint circles
+def draw_arms(canvas, frame_joints_x, frame_joints_y):
+    num_drawn = len(frame_joints_x) - 1 if draw_largest_arms is None else min(draw_largest_arms, len(frame_joints_x) - 1)
+    chain = np.stack([frame_joints_x, frame_joints_y], axis=1)
+
+    # The largest arms come first in the chain, the remaining small ones are drawn as a thin tail
+    cv2.polylines(canvas, [chain[:num_drawn + 1]], False, (0, 0, 0), 5, cv2.LINE_AA)
+    if num_drawn < len(chain) - 1:
+        cv2.polylines(canvas, [chain[num_drawn:]], False, (0, 0, 0), 1, cv2.LINE_AA)
+
+    # Stamp the joint circles of the drawn arms and the pen in a single indexed write
+    stamped = np.append(np.arange(num_drawn + 1), len(chain) - 1)
+    ys = (frame_joints_y[stamped, np.newaxis] + disc_offsets_y).ravel()
+    xs = (frame_joints_x[stamped, np.newaxis] + disc_offsets_x).ravel()
+    inside = (ys >= 0) & (ys < canvas.shape[0]) & (xs >= 0) & (xs < canvas.shape[1])
+    canvas[ys[inside], xs[inside]] = 0
+
+frame_count = 0
+minutes = 60*12
+max_frames = minutes * 60 * fps  # Limit to 1 hour of frames
+
+# Pixel tolerance for the closure search when the speeds have no exact period
+closure_tolerance = 2.0
+
+# Function to find the first frame at which the pen comes back to its starting point
+def predict_closure_frame(radii, speeds, angles, max_frames, tolerance=closure_tolerance):
+    # Arms turning at the same speed act as a single arm, and arms that cancel out do not change the period
+    closure_frame = 1
+    phase_errors = []
+    for speed in np.unique(speeds):
+        same_speed = speeds == speed
+        amplitude = np.sum(radii[same_speed] * np.exp(1j * angles[same_speed]))
+        if speed == 0 or abs(amplitude) < 1e-9:
+            continue
+
+        # An arm turning p / q turns per frame is back where it started every q frames
+        turns = speed / (2 * np.pi)
+        fraction = Fraction(turns).limit_denominator(int(max_frames))
+        closure_frame = math.lcm(closure_frame, fraction.denominator)
+        phase_errors.append(abs(float(fraction) - turns) * 2 * np.pi)
+
+    # The period is exact if no arm is off by more than a nanoradian when the curve closes
+    if closure_frame <= max_frames and max(phase_errors, default=0.0) * closure_frame < 1e-9:
+        return closure_frame, True
+
+    # Fall back to searching the trajectory for the first return within the tolerance
+    first_x, first_y = compute_trajectory(radii, speeds, angles, 1)
+    left_start = False  # The pen has to move away before a return counts
+    for start_frame in range(1, int(max_frames) + 1, chunk_frames):
+        num_frames = min(chunk_frames, int(max_frames) + 1 - start_frame)
+        joints_x, joints_y = compute_trajectory(radii, speeds, angles, num_frames, start_frame)
+        distance_squared = (joints_x[:, -1] - first_x[0, -1]) ** 2 + (joints_y[:, -1] - first_y[0, -1]) ** 2
+        near_start = distance_squared <= tolerance ** 2
+
+        # Ignore the frames before the pen first leaves the tolerance around the start
+        if not left_start:
+            away = np.flatnonzero(~near_start)
+            if len(away) == 0:
+                continue
+            near_start[:away[0]] = False
+            left_start = True
+
+        returns = np.flatnonzero(near_start)
+        if len(returns) > 0:
+            return start_frame + int(returns[0]), False
+
+    # The curve does not close within the frame budget
+    return None, False
+
+# Function to reset the drawing conditions and clear the screen
+def reset_drawing_conditions():
+    global trace_canvas, arms_canvas, line_width  # Make sure these variables are accessible and modifiable inside the function
+    N = num_arms
+    angles = np.random.uniform(0, 2 * np.pi, N)
+
+    # Fourier-style terms: distinct whole frequencies of one base period, smaller for higher frequencies
+    base_period = max(60 * fps, 4 * N)  # Frames for the slowest term to turn once, keeps every term below half a turn per frame
+    frequencies = np.random.choice(np.concatenate([np.arange(-N, 0), np.arange(1, N + 1)]), N, replace=False)
+    speeds = 2 * np.pi * frequencies / base_period
+    radii = np.random.uniform(0, 1, N) / np.abs(frequencies)
+    radii *= height * 0.4 / np.sum(radii)  # The whole chain reaches at most 40% of the height
+
+    # Chain the arms from the largest to the smallest
+    order = np.argsort(radii)[::-1]
+    angles, radii, speeds = angles[order], radii[order], speeds[order]
+    # Reset the canvases to white
+    trace_canvas[:] = 255  # Clear trace canvas
+    arms_canvas[:] = 255   # Clear arms canvas
+    
+    # Set a new random line width only once when resetting conditions
+    line_width = random.randint(5, 125)
+
+    # Work out up front the frame at which this curve closes
+    closure_frame, exact = predict_closure_frame(radii, speeds, angles, max_frames)
+    if closure_frame is None:
+        print(f"Curve does not close within {max_frames} frames.")
+    elif exact:
+        print(f"Curve closes exactly after {closure_frame} frames.")
+    else:
+        print(f"Curve returns within {closure_tolerance} pixels of its start after {closure_frame} frames.")
+
+    return N, angles, radii, speeds, closure_frame
+
+# Initialize variables for each arm
+N, angles, radii, speeds, closure_frame = reset_drawing_conditions()
+
+# Precompute the first block of the trajectory
+cycle_frame = 0  # Frame index within the current drawing cycle
+path_start = 0   # Cycle frame of the first row of the current block
+joints_x, joints_y = compute_trajectory(radii, speeds, angles, chunk_frames)
+
+# Variables to store the previous point
+previous_x = None
+previous_y = None
+drawing_started = False  # Flag to avoid drawing the initial line from the center
+
+# Random HSL color for the trace
+hue = np.random.uniform(0, 360)  # Random hue between 0 and 360
+saturation = 100  # Fully saturated
+lightness = 50  # Moderate lightness
+trace_color = hsl_to_rgb(hue, saturation, lightness)
+
+# Introduce the random_color parameter
+random_color = random.choice([True, False])
+
+# Start time
+start_time = time.time()
+
+try:
+    while frame_count < max_frames:
+        # Compute the next block of the trajectory once the current one is used up
+        if cycle_frame - path_start >= chunk_frames:
+            path_start = cycle_frame
+            joints_x, joints_y = compute_trajectory(radii, speeds, angles, chunk_frames, path_start)
+
+        # Look up the joints for this frame in the precomputed trajectory
+        row = cycle_frame - path_start
+        frame_joints_x = joints_x[row]
+        frame_joints_y = joints_y[row]
+
+        # Reset the arms canvas to be blank for each frame
+        arms_canvas[:] = 255  # White background
+
+        # Draw every arm and joint in a couple of batched calls
+        draw_arms(arms_canvas, frame_joints_x, frame_joints_y)
+
+        # The pen is the end of the last arm
+        x_current = int(frame_joints_x[N])
+        y_current = int(frame_joints_y[N])
+
+        # Only draw the line if we have a valid previous point and after the drawing started
+        if drawing_started:
+            # Check the random_color flag to determine whether to draw in black or color
+            if random_color:
+                # Draw in black
+                cv2.line(trace_canvas, (previous_x, previous_y), (x_current, y_current), (0, 0, 0), line_width, cv2.LINE_AA)
+            else:
+                # Use the color-changing logic
+                cv2.line(trace_canvas, (previous_x, previous_y), (x_current, y_current), trace_color, line_width, cv2.LINE_AA)
+
+        # Mark drawing as started after the first valid point
+        if not drawing_started:
+            drawing_started = True
+
+        # Update the previous point to the current point
+        previous_x = x_current
+        previous_y = y_current
+
+        # Normalize the trace canvas and arms canvas to range [0, 1] for multiplication
+        trace_canvas_normalized = trace_canvas.astype(np.float32) / 255.0
+        arms_canvas_normalized = arms_canvas.astype(np.float32) / 255.0
+
+        # Multiply the two canvases (element-wise)
+        multiplied_frame = trace_canvas_normalized * arms_canvas_normalized
+
+        # Rescale back to [0, 255] and convert to uint8
+        final_frame = (multiplied_frame * 255).astype(np.uint8)
+
+        # Write the combined frame to the video
+        out.write(final_frame)
+
+        frame_count += 1
+        cycle_frame += 1
+
+        # Gradually change the hue (for example, by 0.5 per frame)
+        hue = (hue + 0.5) % 360
+        trace_color = hsl_to_rgb(hue, saturation, lightness)
+
+        # End the cycle on the frame that closes the curve, no per-frame distance test needed
+        if closure_frame is not None and cycle_frame > closure_frame:
+            print(f"Curve closed after {closure_frame} frames, restarting conditions.")
+            # Reset the drawing conditions and continue
+            N, angles, radii, speeds, closure_frame = reset_drawing_conditions()
+            previous_x, previous_y = None, None
+            drawing_started = False
+            cycle_frame = 0
+            path_start = 0
+            joints_x, joints_y = compute_trajectory(radii, speeds, angles, chunk_frames)
+
+        # Print statistics every 1000 frames
+        if frame_count % 1000 == 0:
+            elapsed_time = time.time() - start_time
+            progress = frame_count / max_frames * 100
+            estimated_total_time = elapsed_time / (frame_count / max_frames)
+            estimated_end_time = start_time + estimated_total_time
+            remaining_time = estimated_end_time - time.time()
+
+            print(f"Frame {frame_count}/{max_frames} - Progress: {progress:.2f}%")
+            print(f"Elapsed Time: {elapsed_time:.2f} seconds")
+            print(f"Estimated Total Time: {estimated_total_time:.2f} seconds")
+            print(f"Estimated Time Remaining: {remaining_time:.2f} seconds")
+
+        # Check if the user pressed the 'q' key to exit early
+        if cv2.waitKey(1) & 0xFF == ord('q'):
+            break
+finally:
+    # Ensure the video writer and window are closed properly
+    out.release()
+    print(f"Video saved as {output_file}")
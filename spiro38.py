@@ -0,0 +1,369 @@
+import cv2
+import numpy as np
+import math
+import time
+import os
+import random
+from fractions import Fraction
+
+# Function to convert HSL to RGB
+def hsl_to_rgb(h, s, l):
+    h = float(h)
+    s = float(s) / 100.0
+    l = float(l) / 100.0
+    c = (1.0 - abs(2.0 * l - 1.0)) * s
+    x = c * (1.0 - abs((h / 60.0) % 2.0 - 1.0))
+    m = l - c / 2.0
+    r, g, b = 0, 0, 0
+
+    if 0 <= h < 60:
+        r, g, b = c, x, 0
+    elif 60 <= h < 120:
+        r, g, b = x, c, 0
+    elif 120 <= h < 180:
+        r, g, b = 0, c, x
+    elif 180 <= h < 240:
+        r, g, b = 0, x, c
+    elif 240 <= h < 300:
+        r, g, b = x, 0, c
+    elif 300 <= h < 360:
+        r, g, b = c, 0, x
+
+    r = int((r + m) * 255)
+    g = int((g + m) * 255)
+    b = int((b + m) * 255)
+    return (r, g, b)
+
+# Create 'videos' folder if it doesn't exist
+if not os.path.exists('videos'):
+    os.makedirs('videos')
+
+# Get the current epoch time for the video filename
+epoch_time = int(time.time())
+output_file = os.path.join('videos', f'output_video_{epoch_time}.mp4')
+
+# Video configuration
+width = 1920  # Resolution
+height = 1080
+fps = 60  # Lower FPS
+fourcc = cv2.VideoWriter_fourcc(*'mp4v')  # Change codec
+out = cv2.VideoWriter(output_file, fourcc, fps, (width, height))
+
+# Create a white background for the trace and arms canvases
+trace_canvas = np.ones((height, width, 3), dtype=np.uint8) * 255  # White background for tracing
+arms_canvas = np.ones((height, width, 3), dtype=np.uint8) * 255   # White background for arms
+
+# Global variable to store the line width
+line_width = random.randint(5, 125)  # Initialize with a random value
+
+# Initial position
+initial_x = width // 2
+initial_y = height // 2
+
+# Number of frames of trajectory computed in one vectorized pass
+chunk_frames = 60 * fps  # One minute of frames at a time
+
+# Function to compute every joint of the arm chain for a block of frames in one vectorized pass
+def compute_trajectory(radii, speeds, angles, num_frames, start_frame=0):
+    # Angles come straight from the frame index, so there is no drift from millions of += steps
+    frame_indices = np.arange(start_frame, start_frame + num_frames)
+    arm_angles = angles[np.newaxis, :] + np.outer(frame_indices, speeds)
+
+    # Each arm is a complex exponential scaled by its radius
+    arm_vectors = radii[np.newaxis, :] * np.exp(1j * arm_angles)
+
+    # Truncate each arm like int() in the per-frame loop, then chain the arms with a cumulative sum
+    joints_x = np.empty((num_frames, len(radii) + 1), dtype=np.int64)
+    joints_y = np.empty((num_frames, len(radii) + 1), dtype=np.int64)
+    joints_x[:, 0] = initial_x
+    joints_y[:, 0] = initial_y
+    np.cumsum(np.trunc(arm_vectors.real).astype(np.int64), axis=1, out=joints_x[:, 1:])
+    np.cumsum(np.trunc(arm_vectors.imag).astype(np.int64), axis=1, out=joints_y[:, 1:])
+    joints_x[:, 1:] += initial_x
+    joints_y[:, 1:] += initial_y
+
+    # Column 0 is the centre, the last column is the pen
+    return joints_x, joints_y
+
+frame_count = 0
+minutes = 60*12
+max_frames = minutes * 60 * fps  # Limit to 1 hour of frames
+max_steps = max_frames * 100  # Simulation steps a curve may take, time-lapse draws many per output frame
+
+# Adaptive sub-stepping settings
+max_segment_length = 4.0  # Longest straight piece of trace in pixels
+max_turn_angle = np.pi / 36  # Largest change of direction between two pieces
+trace_shift = 4  # Fractional bits of the sub-pixel polyline coordinates
+
+# Function to compute the unrounded pen position at any, possibly fractional, frame times
+def compute_pen_points(radii, speeds, angles, times):
+    return np.sum(radii * np.exp(1j * (angles + np.outer(times, speeds))), axis=1) + complex(initial_x, initial_y)
+
+# Function to compute the pen velocity in pixels per frame at the given frame times
+def compute_pen_velocities(radii, speeds, angles, times):
+    return np.sum(1j * speeds * radii * np.exp(1j * (angles + np.outer(times, speeds))), axis=1)
+
+# Function to split each frame's trace segment into as many sub-steps as its length and curvature need
+def compute_sub_steps(radii, speeds, angles, num_frames, start_frame=0):
+    # Segment i runs from frame start_frame + i - 1 to frame start_frame + i
+    frame_times = np.arange(start_frame - 1, start_frame + num_frames, dtype=np.float64)
+    points = compute_pen_points(radii, speeds, angles, frame_times)
+    velocities = compute_pen_velocities(radii, speeds, angles, frame_times)
+
+    # Long segments and segments where the curve turns sharply get more sub-steps
+    length = np.maximum(np.abs(np.diff(points)), 0.5 * (np.abs(velocities[1:]) + np.abs(velocities[:-1])))
+    turn = np.abs(np.angle(velocities[1:] * np.conj(velocities[:-1])))
+    sub_steps = np.maximum(1, np.maximum(np.ceil(length / max_segment_length), np.ceil(turn / max_turn_angle))).astype(np.int64)
+
+    # Fractional frame time of every sub-step, all segments at once
+    offsets = np.concatenate([[0], np.cumsum(sub_steps)])
+    segment = np.repeat(np.arange(num_frames), sub_steps)
+    step_in_segment = np.arange(offsets[-1]) - offsets[segment] + 1
+    sub_times = frame_times[segment] + step_in_segment / sub_steps[segment]
+    sub_points = np.concatenate([points[:1], compute_pen_points(radii, speeds, angles, sub_times)])
+
+    # Segment i is the polyline sub_step_points[offsets[i]:offsets[i + 1] + 1], in fixed point for cv2
+    sub_step_points = np.round(np.stack([sub_points.real, sub_points.imag], axis=1) * (1 << trace_shift)).astype(np.int32)
+    return sub_step_points, offsets
+
+# Most points passed to cv2.polylines in one piece, longer paths are split into overlapping pieces
+polyline_chunk_points = 4096
+
+# Function to draw a block of path points with as few cv2.polylines calls as possible
+def draw_trace_segments(canvas, points, colors, width, shift=trace_shift):
+    # colors is either one colour for the whole block or one colour per segment
+    if isinstance(colors, tuple):
+        runs = [(0, len(points) - 1, colors)]
+    else:
+        # Consecutive segments of the same colour form a run that is drawn in one go
+        changes = np.flatnonzero(np.any(colors[1:] != colors[:-1], axis=1)) + 1
+        starts = np.concatenate([[0], changes])
+        ends = np.concatenate([changes, [len(colors)]])
+        runs = [(start, end, tuple(colors[start].tolist())) for start, end in zip(starts, ends)]
+
+    for start, end, color in runs:
+        # Pieces share their end points so the round joins between them stay intact
+        pieces = [points[i:min(i + polyline_chunk_points, end) + 1] for i in range(start, end, polyline_chunk_points)]
+        cv2.polylines(canvas, pieces, False, color, width, cv2.LINE_AA, shift)
+
+# Pixel tolerance for the closure search when the speeds have no exact period
+closure_tolerance = 2.0
+
+# Function to find the first frame at which the pen comes back to its starting point
+def predict_closure_frame(radii, speeds, angles, max_frames, tolerance=closure_tolerance):
+    # Arms turning at the same speed act as a single arm, and arms that cancel out do not change the period
+    closure_frame = 1
+    phase_errors = []
+    for speed in np.unique(speeds):
+        same_speed = speeds == speed
+        amplitude = np.sum(radii[same_speed] * np.exp(1j * angles[same_speed]))
+        if speed == 0 or abs(amplitude) < 1e-9:
+            continue
+
+        # An arm turning p / q turns per frame is back where it started every q frames
+        turns = speed / (2 * np.pi)
+        fraction = Fraction(turns).limit_denominator(int(max_frames))
+        closure_frame = math.lcm(closure_frame, fraction.denominator)
+        phase_errors.append(abs(float(fraction) - turns) * 2 * np.pi)
+
+    # The period is exact if no arm is off by more than a nanoradian when the curve closes
+    if closure_frame <= max_frames and max(phase_errors, default=0.0) * closure_frame < 1e-9:
+        return closure_frame, True
+
+    # Fall back to searching the trajectory for the first return within the tolerance
+    first_x, first_y = compute_trajectory(radii, speeds, angles, 1)
+    left_start = False  # The pen has to move away before a return counts
+    for start_frame in range(1, int(max_frames) + 1, chunk_frames):
+        num_frames = min(chunk_frames, int(max_frames) + 1 - start_frame)
+        joints_x, joints_y = compute_trajectory(radii, speeds, angles, num_frames, start_frame)
+        distance_squared = (joints_x[:, -1] - first_x[0, -1]) ** 2 + (joints_y[:, -1] - first_y[0, -1]) ** 2
+        near_start = distance_squared <= tolerance ** 2
+
+        # Ignore the frames before the pen first leaves the tolerance around the start
+        if not left_start:
+            away = np.flatnonzero(~near_start)
+            if len(away) == 0:
+                continue
+            near_start[:away[0]] = False
+            left_start = True
+
+        returns = np.flatnonzero(near_start)
+        if len(returns) > 0:
+            return start_frame + int(returns[0]), False
+
+    # The curve does not close within the frame budget
+    return None, False
+
+# Time-lapse settings: every output frame advances steps_per_frame simulation steps
+steps_per_frame = 1  # Steps per output frame when no target duration is set
+target_duration = 30  # Seconds of video per closed curve, None keeps steps_per_frame as set
+frame_steps = steps_per_frame  # Steps per output frame for the current curve
+
+# Function to work out the hue of every sub-step between two rows of the sub-step table
+def compute_sub_step_hues(offsets, first_row, last_row, hue):
+    # Row first_row is one simulation step after the step drawn with the given hue
+    sub_steps = np.diff(offsets[first_row:last_row + 2])
+    step_index = np.repeat(np.arange(len(sub_steps)), sub_steps)
+    position = np.arange(len(step_index)) - (offsets[first_row:last_row + 1] - offsets[first_row])[step_index] + 1
+    return (hue + hue_step * (step_index + position / sub_steps[step_index])) % 360
+
+# Function to reset the drawing conditions and clear the screen
+def reset_drawing_conditions():
+    global trace_canvas, arms_canvas, line_width, frame_steps, block_steps  # Make sure these variables are accessible and modifiable inside the function
+    N = random.randint(2, 2)
+    angles = np.zeros(N)
+    radii = np.random.uniform(0, height // 3, N) * 1.0
+    denominators = np.array([-8, -7, -6, -5, -4, -3, -2, 2, 3, 4, 5, 6, 7, 8])
+    speeds = np.pi / np.random.choice(denominators, N)/10
+    # Reset the canvases to white
+    trace_canvas[:] = 255  # Clear trace canvas
+    arms_canvas[:] = 255   # Clear arms canvas
+    
+    # Set a new random line width only once when resetting conditions
+    line_width = random.randint(5, 125)
+
+    # Work out up front the frame at which this curve closes
+    closure_frame, exact = predict_closure_frame(radii, speeds, angles, max_steps)
+    if closure_frame is None:
+        print(f"Curve does not close within {max_steps} frames.")
+    elif exact:
+        print(f"Curve closes exactly after {closure_frame} frames.")
+    else:
+        print(f"Curve returns within {closure_tolerance} pixels of its start after {closure_frame} frames.")
+
+    # Squeeze the whole curve into the target duration
+    if target_duration is not None and closure_frame is not None:
+        frame_steps = max(1, math.ceil(closure_frame / (target_duration * fps)))
+    else:
+        frame_steps = steps_per_frame
+    print(f"Drawing {frame_steps} simulation steps per output frame.")
+
+    # Trajectory blocks always hold at least one output frame of steps
+    block_steps = max(chunk_frames, frame_steps)
+
+    return N, angles, radii, speeds, closure_frame
+
+# Initialize variables for each arm
+N, angles, radii, speeds, closure_frame = reset_drawing_conditions()
+
+# Precompute the first block of the trajectory
+cycle_frame = 0  # Last simulation step drawn in the current cycle
+path_start = 0   # Simulation step of the first row of the current block
+joints_x, joints_y = compute_trajectory(radii, speeds, angles, block_steps)
+sub_step_points, sub_step_offsets = compute_sub_steps(radii, speeds, angles, block_steps)
+
+drawing_started = False  # Flag to avoid drawing the initial line from the center
+
+# Random HSL color for the trace
+hue = np.random.uniform(0, 360)  # Random hue between 0 and 360
+hue_step = 0.5  # Hue change per frame
+saturation = 100  # Fully saturated
+lightness = 50  # Moderate lightness
+
+# Introduce the random_color parameter
+random_color = random.choice([True, False])
+
+# Start time
+start_time = time.time()
+
+try:
+    while frame_count < max_frames:
+        # Advance the simulation by this frame's steps, stopping on the step that closes the curve
+        last_step = cycle_frame + frame_steps if drawing_started else 0
+        if closure_frame is not None:
+            last_step = min(last_step, closure_frame)
+
+        # Compute the next block of the trajectory once this frame's steps run past the current one
+        if last_step - path_start >= block_steps:
+            path_start = cycle_frame + 1
+            joints_x, joints_y = compute_trajectory(radii, speeds, angles, block_steps, path_start)
+            sub_step_points, sub_step_offsets = compute_sub_steps(radii, speeds, angles, block_steps, path_start)
+
+        # Only the arms at the last step are shown
+        row = last_step - path_start
+        frame_joints_x = joints_x[row].tolist()
+        frame_joints_y = joints_y[row].tolist()
+
+        # Reset the arms canvas to be blank for each frame
+        arms_canvas[:] = 255  # White background
+
+        # Loop through each arm to draw it
+        for j in range(N):
+            arm_start = (frame_joints_x[j], frame_joints_y[j])
+            arm_end = (frame_joints_x[j + 1], frame_joints_y[j + 1])
+
+            # Draw the arm as a line from the previous joint to the next one in black
+            cv2.line(arms_canvas, arm_start, arm_end, (0, 0, 0), 5, cv2.LINE_AA)
+
+            # Draw black circles at each articulation point
+            cv2.circle(arms_canvas, arm_start, 10, (0, 0, 0), -1)  # Black circle at articulation point
+            cv2.circle(arms_canvas, arm_end, 10, (0, 0, 0), -1)  # Black circle at the next articulation point
+
+        # Draw every sub-stepped segment simulated for this frame in one batch
+        if drawing_started:
+            first_row = cycle_frame + 1 - path_start
+            polyline = sub_step_points[sub_step_offsets[first_row]:sub_step_offsets[row + 1] + 1]
+            # Check the random_color flag to determine whether to draw in black or color
+            if random_color:
+                # Draw in black
+                draw_trace_segments(trace_canvas, polyline, (0, 0, 0), line_width)
+            else:
+                # Use the color-changing logic, the hue moves on smoothly across the sub-steps
+                sub_step_hues = compute_sub_step_hues(sub_step_offsets, first_row, row, hue)
+                sub_step_colors = np.array([hsl_to_rgb(h, saturation, lightness) for h in sub_step_hues])
+                draw_trace_segments(trace_canvas, polyline, sub_step_colors, line_width)
+
+        # Mark drawing as started after the first valid point
+        if not drawing_started:
+            drawing_started = True
+
+        # Normalize the trace canvas and arms canvas to range [0, 1] for multiplication
+        trace_canvas_normalized = trace_canvas.astype(np.float32) / 255.0
+        arms_canvas_normalized = arms_canvas.astype(np.float32) / 255.0
+
+        # Multiply the two canvases (element-wise)
+        multiplied_frame = trace_canvas_normalized * arms_canvas_normalized
+
+        # Rescale back to [0, 255] and convert to uint8
+        final_frame = (multiplied_frame * 255).astype(np.uint8)
+
+        # Write the combined frame to the video
+        out.write(final_frame)
+
+        frame_count += 1
+
+        # Gradually change the hue (for example, by 0.5 per simulation step)
+        hue = (hue + hue_step * (last_step - cycle_frame)) % 360
+        cycle_frame = last_step
+
+        # End the cycle on the frame that closes the curve, no per-frame distance test needed
+        if closure_frame is not None and cycle_frame >= closure_frame:
+            print(f"Curve closed after {closure_frame} frames, restarting conditions.")
+            # Reset the drawing conditions and continue
+            N, angles, radii, speeds, closure_frame = reset_drawing_conditions()
+            drawing_started = False
+            cycle_frame = 0
+            path_start = 0
+            joints_x, joints_y = compute_trajectory(radii, speeds, angles, block_steps)
+            sub_step_points, sub_step_offsets = compute_sub_steps(radii, speeds, angles, block_steps)
+
+        # Print statistics every 1000 frames
+        if frame_count % 1000 == 0:
+            elapsed_time = time.time() - start_time
+            progress = frame_count / max_frames * 100
+            estimated_total_time = elapsed_time / (frame_count / max_frames)
+            estimated_end_time = start_time + estimated_total_time
+            remaining_time = estimated_end_time - time.time()
+
+            print(f"Frame {frame_count}/{max_frames} - Progress: {progress:.2f}%")
+            print(f"Elapsed Time: {elapsed_time:.2f} seconds")
+            print(f"Estimated Total Time: {estimated_total_time:.2f} seconds")
+            print(f"Estimated Time Remaining: {remaining_time:.2f} seconds")
+
+        # Check if the user pressed the 'q' key to exit early
+        if cv2.waitKey(1) & 0xFF == ord('q'):
+            break
+finally:
+    # Ensure the video writer and window are closed properly
+    out.release()
+    print(f"Video saved as {output_file}")
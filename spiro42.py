@@ -0,0 +1,229 @@
+import cv2
+import numpy as np
+import math
+import time
+import os
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+# Function to convert arrays of HSL values to BGR, the channel order OpenCV draws in
+def hsl_to_bgr(h, s, l):
+    h, s, l = np.broadcast_arrays(np.asarray(h, dtype=np.float64) % 360.0, np.asarray(s, dtype=np.float64) / 100.0,
+                                  np.asarray(l, dtype=np.float64) / 100.0)
+    c = (1.0 - np.abs(2.0 * l - 1.0)) * s
+    x = c * (1.0 - np.abs((h / 60.0) % 2.0 - 1.0))
+    m = l - c / 2.0
+    zero = np.zeros_like(c)
+
+    # Each 60 degree sector of the hue circle picks its own arrangement of c, x and 0
+    sector = (h // 60.0).astype(np.int64) % 6
+    r = np.choose(sector, [c, x, zero, zero, x, c])
+    g = np.choose(sector, [x, c, c, x, zero, zero])
+    b = np.choose(sector, [zero, zero, x, c, c, x])
+
+    return ((np.stack([b, g, r], axis=-1) + m[..., np.newaxis]) * 255).astype(np.uint8)
+
+# Hue lookup table settings
+hue_lut_size = 3600  # Entries around the hue circle, a tenth of a degree apart
+
+# Function to build, once, the BGR colour of every entry of the hue circle
+def build_hue_lut(saturation, lightness, size=hue_lut_size):
+    return hsl_to_bgr(np.arange(size) * (360.0 / size), saturation, lightness)
+
+# Function to look up the colours of an array of hues in one indexing call
+def hue_colors(hue_lut, hues):
+    size = len(hue_lut)
+    return hue_lut[np.round(np.asarray(hues) * (size / 360.0)).astype(np.int64) % size]
+
+# Create 'posters' folder if it doesn't exist
+if not os.path.exists('posters'):
+    os.makedirs('posters')
+
+# Get the current epoch time for the poster filename
+epoch_time = int(time.time())
+output_file = os.path.join('posters', f'poster_{epoch_time}.npy')
+image_file = os.path.join('posters', f'poster_{epoch_time}.png')
+
+# Poster configuration, the curve is designed on the video canvas and scaled up to the poster
+width = 15360  # 16K, use 30720 x 17280 for 32K
+height = 8640
+design_height = 1080  # Height of the video canvas the radii and line widths are chosen for
+scale = height / design_height
+
+# Tiling configuration, peak memory is about num_workers tiles whatever the poster size
+tile_size = 2048  # Side of a square tile in pixels
+num_workers = os.cpu_count() or 1
+write_image = True  # Also encode the finished poster as a PNG next to the raw memory-mapped array
+
+# Initial position
+initial_x = width // 2
+initial_y = height // 2
+
+# Adaptive sub-stepping settings
+max_segment_length = 4.0  # Longest straight piece of trace in poster pixels
+max_turn_angle = np.pi / 36  # Largest change of direction between two pieces
+trace_shift = 4  # Fractional bits of the sub-pixel polyline coordinates
+
+# Function to compute the unrounded pen position at any, possibly fractional, frame times
+def compute_pen_points(radii, speeds, angles, times):
+    return np.sum(radii * np.exp(1j * (angles + np.outer(times, speeds))), axis=1) + complex(initial_x, initial_y)
+
+# Function to compute the pen velocity in pixels per frame at the given frame times
+def compute_pen_velocities(radii, speeds, angles, times):
+    return np.sum(1j * speeds * radii * np.exp(1j * (angles + np.outer(times, speeds))), axis=1)
+
+# Function to split each frame's trace segment into as many sub-steps as its length and curvature need
+def compute_sub_steps(radii, speeds, angles, num_frames, start_frame=0):
+    # Segment i runs from frame start_frame + i - 1 to frame start_frame + i
+    frame_times = np.arange(start_frame - 1, start_frame + num_frames, dtype=np.float64)
+    points = compute_pen_points(radii, speeds, angles, frame_times)
+    velocities = compute_pen_velocities(radii, speeds, angles, frame_times)
+
+    # Long segments and segments where the curve turns sharply get more sub-steps
+    length = np.maximum(np.abs(np.diff(points)), 0.5 * (np.abs(velocities[1:]) + np.abs(velocities[:-1])))
+    turn = np.abs(np.angle(velocities[1:] * np.conj(velocities[:-1])))
+    sub_steps = np.maximum(1, np.maximum(np.ceil(length / max_segment_length), np.ceil(turn / max_turn_angle))).astype(np.int64)
+
+    # Fractional frame time of every sub-step, all segments at once
+    offsets = np.concatenate([[0], np.cumsum(sub_steps)])
+    segment = np.repeat(np.arange(num_frames), sub_steps)
+    step_in_segment = np.arange(offsets[-1]) - offsets[segment] + 1
+    sub_times = frame_times[segment] + step_in_segment / sub_steps[segment]
+    sub_points = np.concatenate([points[:1], compute_pen_points(radii, speeds, angles, sub_times)])
+
+    # Segment i is the polyline sub_step_points[offsets[i]:offsets[i + 1] + 1], in fixed point for cv2
+    sub_step_points = np.round(np.stack([sub_points.real, sub_points.imag], axis=1) * (1 << trace_shift)).astype(np.int32)
+    return sub_step_points, offsets
+
+# Function to work out the hue of every sub-step between two rows of the sub-step table
+def compute_sub_step_hues(offsets, first_row, last_row, hue):
+    # Row first_row is one simulation step after the step drawn with the given hue
+    sub_steps = np.diff(offsets[first_row:last_row + 2])
+    step_index = np.repeat(np.arange(len(sub_steps)), sub_steps)
+    position = np.arange(len(step_index)) - (offsets[first_row:last_row + 1] - offsets[first_row])[step_index] + 1
+    return (hue + hue_step * (step_index + position / sub_steps[step_index])) % 360
+
+# Most points passed to cv2.polylines in one piece, longer paths are split into overlapping pieces
+polyline_chunk_points = 4096
+
+# Function to draw a block of path points with as few cv2.polylines calls as possible
+def draw_trace_segments(canvas, points, colors, width, shift=trace_shift):
+    # colors is either one colour for the whole block or one colour per segment
+    if isinstance(colors, tuple):
+        runs = [(0, len(points) - 1, colors)]
+    else:
+        # Consecutive segments of the same colour form a run that is drawn in one go
+        changes = np.flatnonzero(np.any(colors[1:] != colors[:-1], axis=1)) + 1
+        starts = np.concatenate([[0], changes])
+        ends = np.concatenate([changes, [len(colors)]])
+        runs = [(start, end, tuple(colors[start].tolist())) for start, end in zip(starts, ends)]
+
+    for start, end, color in runs:
+        # Pieces share their end points so the round joins between them stay intact
+        pieces = [points[i:min(i + polyline_chunk_points, end) + 1] for i in range(start, end, polyline_chunk_points)]
+        cv2.polylines(canvas, pieces, False, color, width, cv2.LINE_AA, shift)
+
+# Function to list, for every tile, the path segments whose stroke reaches into it
+def assign_segments_to_tiles(points, margin, tiles_x, tiles_y):
+    # Bounding box of every segment grown by the stroke margin, in whole tiles
+    starts = points[:-1] >> trace_shift
+    ends = points[1:] >> trace_shift
+    low = (np.minimum(starts, ends) - margin) // tile_size
+    high = (np.maximum(starts, ends) + margin) // tile_size
+    low = np.maximum(low, 0)
+    high = np.minimum(high, [tiles_x - 1, tiles_y - 1])
+
+    # Segments wholly off the poster touch no tile
+    span_x = np.maximum(high[:, 0] - low[:, 0] + 1, 0)
+    span_y = np.maximum(high[:, 1] - low[:, 1] + 1, 0)
+    counts = span_x * span_y
+
+    # One (tile, segment) pair for every tile each segment's box covers, all segments at once
+    segment = np.repeat(np.arange(len(counts)), counts)
+    position = np.arange(len(segment)) - np.repeat(np.cumsum(counts) - counts, counts)
+    tile_x = low[segment, 0] + position % span_x[segment]
+    tile_y = low[segment, 1] + position // span_x[segment]
+    tile = tile_y * tiles_x + tile_x
+
+    # A stable sort keeps every tile's segments in drawing order
+    order = np.argsort(tile, kind='stable')
+    bounds = np.searchsorted(tile[order], np.arange(tiles_x * tiles_y + 1))
+    return [segment[order[bounds[t]:bounds[t + 1]]] for t in range(tiles_x * tiles_y)]
+
+# Function to rasterize one tile on its own and copy it into the poster
+def render_tile(tile_index):
+    tile_y, tile_x = divmod(tile_index, tiles_x)
+    left, top = tile_x * tile_size, tile_y * tile_size
+    right, bottom = min(left + tile_size, width), min(top + tile_size, height)
+    # cv2 clips strokes against the image border slightly differently from how it draws them inside,
+    # so each tile is drawn with a guard band a stroke wide around it and only its interior is kept
+    tile = np.full((bottom - top + 2 * tile_guard, right - left + 2 * tile_guard) + poster.shape[2:], 255, dtype=np.uint8)
+
+    segments = tile_segments[tile_index]
+    if len(segments) > 0:
+        # Every unbroken run of consecutive segments is one polyline, shifted into tile coordinates
+        origin = np.array([(left - tile_guard) << trace_shift, (top - tile_guard) << trace_shift], dtype=np.int32)
+        breaks = np.flatnonzero(np.diff(segments) != 1) + 1
+        for run in np.split(segments, breaks):
+            first, last = int(run[0]), int(run[-1])
+            colors = trace_colors if isinstance(trace_colors, tuple) else trace_colors[first:last + 1]
+            draw_trace_segments(tile, path[first:last + 2] - origin, colors, line_width)
+
+    poster[top:bottom, left:right] = tile[tile_guard:-tile_guard, tile_guard:-tile_guard]
+    return len(segments)
+
+# Random curve, chosen the way the video scripts choose theirs
+N = random.randint(2, 2)
+angles = np.zeros(N)
+radii = np.random.uniform(0, design_height // 3, N) * scale
+denominators = np.array([-8, -7, -6, -5, -4, -3, -2, 2, 3, 4, 5, 6, 7, 8])
+chosen_denominators = np.random.choice(denominators, N)
+speeds = np.pi / chosen_denominators / 10
+line_width = int(round(random.randint(5, 125) * scale))
+random_color = random.choice([True, False])
+
+# Random HSL color for the trace
+hue = np.random.uniform(0, 360)  # Random hue between 0 and 360
+hue_step = 0.5  # Hue change per frame
+saturation = 100  # Fully saturated
+lightness = 50  # Moderate lightness
+hue_lut = build_hue_lut(saturation, lightness)  # Colours of the whole hue circle, built once
+
+# An arm turning pi / (10 * d) per frame is back where it started every 20 * |d| frames
+closure_frame = int(np.lcm.reduce(20 * np.abs(chosen_denominators)))
+print(f"Curve closes exactly after {closure_frame} frames.")
+
+# Start time
+start_time = time.time()
+
+# The closed path, drawn from frame 0 to the closing frame like the video loop
+sub_step_points, sub_step_offsets = compute_sub_steps(radii, speeds, angles, closure_frame + 1)
+path = sub_step_points[sub_step_offsets[1]:]
+if random_color:
+    trace_colors = (0, 0, 0)
+else:
+    trace_colors = hue_colors(hue_lut, compute_sub_step_hues(sub_step_offsets, 1, closure_frame, hue))
+
+# Black-ink posters are a single channel, colour posters are BGR
+poster_shape = (height, width) if random_color else (height, width, 3)
+poster = np.lib.format.open_memmap(output_file, mode='w+', dtype=np.uint8, shape=poster_shape)
+
+# Tiles are independent, so they rasterize in parallel, cv2 releases the GIL while drawing
+tiles_x = math.ceil(width / tile_size)
+tiles_y = math.ceil(height / tile_size)
+tile_segments = assign_segments_to_tiles(path, line_width // 2 + 4, tiles_x, tiles_y)
+tile_guard = line_width + 32  # Extra pixels drawn around every tile and thrown away
+with ThreadPoolExecutor(max_workers=num_workers) as executor:
+    segments_drawn = sum(executor.map(render_tile, range(tiles_x * tiles_y)))
+poster.flush()
+
+elapsed_time = time.time() - start_time
+print(f"Rendered {width}x{height} poster as {tiles_x * tiles_y} tiles of {tile_size} pixels on {num_workers} workers "
+      f"in {elapsed_time:.2f} seconds.")
+print(f"{len(path) - 1} path segments, {segments_drawn} segment draws across tiles.")
+print(f"Poster saved as {output_file}")
+
+# The encoder reads the memory-mapped pages, so the poster never has to be resident as a whole
+if write_image:
+    cv2.imwrite(image_file, poster)
+    print(f"Image saved as {image_file}")
@@ -0,0 +1,500 @@
+import cv2
+import numpy as np
+import math
+import time
+import os
+import random
+from fractions import Fraction
+
+# Function to convert arrays of HSL values to BGR, the channel order OpenCV draws in
+def hsl_to_bgr(h, s, l):
+    h, s, l = np.broadcast_arrays(np.asarray(h, dtype=np.float64) % 360.0, np.asarray(s, dtype=np.float64) / 100.0,
+                                  np.asarray(l, dtype=np.float64) / 100.0)
+    c = (1.0 - np.abs(2.0 * l - 1.0)) * s
+    x = c * (1.0 - np.abs((h / 60.0) % 2.0 - 1.0))
+    m = l - c / 2.0
+    zero = np.zeros_like(c)
+
+    # Each 60 degree sector of the hue circle picks its own arrangement of c, x and 0
+    sector = (h // 60.0).astype(np.int64) % 6
+    r = np.choose(sector, [c, x, zero, zero, x, c])
+    g = np.choose(sector, [x, c, c, x, zero, zero])
+    b = np.choose(sector, [zero, zero, x, c, c, x])
+
+    return ((np.stack([b, g, r], axis=-1) + m[..., np.newaxis]) * 255).astype(np.uint8)
+
+# Hue lookup table settings
+hue_lut_size = 3600  # Entries around the hue circle, a tenth of a degree apart
+
+# Function to build, once, the BGR colour of every entry of the hue circle
+def build_hue_lut(saturation, lightness, size=hue_lut_size):
+    return hsl_to_bgr(np.arange(size) * (360.0 / size), saturation, lightness)
+
+# Function to look up the colours of an array of hues in one indexing call
+def hue_colors(hue_lut, hues):
+    size = len(hue_lut)
+    return hue_lut[np.round(np.asarray(hues) * (size / 360.0)).astype(np.int64) % size]
+
+# Create 'videos' folder if it doesn't exist
+if not os.path.exists('videos'):
+    os.makedirs('videos')
+
+# Create 'images' folder if it doesn't exist
+if not os.path.exists('images'):
+    os.makedirs('images')
+
+# Get the current epoch time for the video filename
+epoch_time = int(time.time())
+output_file = os.path.join('videos', f'output_video_{epoch_time}.mp4')
+image_file = os.path.join('images', f'poster_{epoch_time}.png')
+
+# Poster mode draws the finished curve once and saves it as an image instead of rendering the video
+poster_mode = True
+
+# Video configuration
+width = 1920  # Resolution
+height = 1080
+fps = 60  # Lower FPS
+fourcc = cv2.VideoWriter_fourcc(*'mp4v')  # Change codec
+
+# Introduce the random_color parameter
+random_color = random.choice([True, False])
+
+# Black-ink runs keep both canvases as single-channel planes and composite in one channel
+monochrome = random_color
+grayscale_writer = True  # Hand grayscale frames straight to the encoder instead of expanding them to BGR
+canvas_shape = (height, width) if monochrome else (height, width, 3)
+if not poster_mode:
+    out = cv2.VideoWriter(output_file, fourcc, fps, (width, height), isColor=not (monochrome and grayscale_writer))
+
+# Create a white background for the trace and arms canvases
+trace_canvas = np.ones(canvas_shape, dtype=np.uint8) * 255  # White background for tracing
+arms_canvas = np.ones(canvas_shape, dtype=np.uint8) * 255   # White background for arms
+
+# Frame the grayscale composite is expanded into when the encoder needs BGR
+if monochrome and not grayscale_writer:
+    bgr_frame = np.empty((height, width, 3), dtype=np.uint8)
+
+# Global variable to store the line width
+line_width = random.randint(5, 125)  # Initialize with a random value
+
+# Initial position
+initial_x = width // 2
+initial_y = height // 2
+
+# Number of frames of trajectory computed in one vectorized pass
+chunk_frames = 60 * fps  # One minute of frames at a time
+
+# Function to compute every joint of the arm chain for a block of frames in one vectorized pass
+def compute_trajectory(radii, speeds, angles, num_frames, start_frame=0):
+    # Angles come straight from the frame index, so there is no drift from millions of += steps
+    frame_indices = np.arange(start_frame, start_frame + num_frames)
+    arm_angles = angles[np.newaxis, :] + np.outer(frame_indices, speeds)
+
+    # Each arm is a complex exponential scaled by its radius
+    arm_vectors = radii[np.newaxis, :] * np.exp(1j * arm_angles)
+
+    # Truncate each arm like int() in the per-frame loop, then chain the arms with a cumulative sum
+    joints_x = np.empty((num_frames, len(radii) + 1), dtype=np.int64)
+    joints_y = np.empty((num_frames, len(radii) + 1), dtype=np.int64)
+    joints_x[:, 0] = initial_x
+    joints_y[:, 0] = initial_y
+    np.cumsum(np.trunc(arm_vectors.real).astype(np.int64), axis=1, out=joints_x[:, 1:])
+    np.cumsum(np.trunc(arm_vectors.imag).astype(np.int64), axis=1, out=joints_y[:, 1:])
+    joints_x[:, 1:] += initial_x
+    joints_y[:, 1:] += initial_y
+
+    # Column 0 is the centre, the last column is the pen
+    return joints_x, joints_y
+
+frame_count = 0
+minutes = 60*12
+max_frames = minutes * 60 * fps  # Limit to 1 hour of frames
+max_steps = max_frames * 100  # Simulation steps a curve may take, time-lapse draws many per output frame
+
+# Adaptive sub-stepping settings
+max_segment_length = 4.0  # Longest straight piece of trace in pixels
+max_turn_angle = np.pi / 36  # Largest change of direction between two pieces
+trace_shift = 4  # Fractional bits of the sub-pixel polyline coordinates
+
+# Function to compute the unrounded pen position at any, possibly fractional, frame times
+def compute_pen_points(radii, speeds, angles, times):
+    return np.sum(radii * np.exp(1j * (angles + np.outer(times, speeds))), axis=1) + complex(initial_x, initial_y)
+
+# Function to compute the pen velocity in pixels per frame at the given frame times
+def compute_pen_velocities(radii, speeds, angles, times):
+    return np.sum(1j * speeds * radii * np.exp(1j * (angles + np.outer(times, speeds))), axis=1)
+
+# Function to split each frame's trace segment into as many sub-steps as its length and curvature need
+def compute_sub_steps(radii, speeds, angles, num_frames, start_frame=0):
+    # Segment i runs from frame start_frame + i - 1 to frame start_frame + i
+    frame_times = np.arange(start_frame - 1, start_frame + num_frames, dtype=np.float64)
+    points = compute_pen_points(radii, speeds, angles, frame_times)
+    velocities = compute_pen_velocities(radii, speeds, angles, frame_times)
+
+    # Long segments and segments where the curve turns sharply get more sub-steps
+    length = np.maximum(np.abs(np.diff(points)), 0.5 * (np.abs(velocities[1:]) + np.abs(velocities[:-1])))
+    turn = np.abs(np.angle(velocities[1:] * np.conj(velocities[:-1])))
+    sub_steps = np.maximum(1, np.maximum(np.ceil(length / max_segment_length), np.ceil(turn / max_turn_angle))).astype(np.int64)
+
+    # Fractional frame time of every sub-step, all segments at once
+    offsets = np.concatenate([[0], np.cumsum(sub_steps)])
+    segment = np.repeat(np.arange(num_frames), sub_steps)
+    step_in_segment = np.arange(offsets[-1]) - offsets[segment] + 1
+    sub_times = frame_times[segment] + step_in_segment / sub_steps[segment]
+    sub_points = np.concatenate([points[:1], compute_pen_points(radii, speeds, angles, sub_times)])
+
+    # Segment i is the polyline sub_step_points[offsets[i]:offsets[i + 1] + 1], in fixed point for cv2
+    sub_step_points = np.round(np.stack([sub_points.real, sub_points.imag], axis=1) * (1 << trace_shift)).astype(np.int32)
+    return sub_step_points, offsets
+
+# Most points passed to cv2.polylines in one piece, longer paths are split into overlapping pieces
+polyline_chunk_points = 4096
+
+# Function to draw a block of path points with as few cv2.polylines calls as possible
+def draw_trace_segments(canvas, points, colors, width, shift=trace_shift):
+    # colors is either one colour for the whole block or one colour per segment
+    if isinstance(colors, tuple):
+        runs = [(0, len(points) - 1, colors)]
+    else:
+        # Consecutive segments of the same colour form a run that is drawn in one go
+        changes = np.flatnonzero(np.any(colors[1:] != colors[:-1], axis=1)) + 1
+        starts = np.concatenate([[0], changes])
+        ends = np.concatenate([changes, [len(colors)]])
+        runs = [(start, end, tuple(colors[start].tolist())) for start, end in zip(starts, ends)]
+
+    for start, end, color in runs:
+        # Pieces share their end points so the round joins between them stay intact
+        pieces = [points[i:min(i + polyline_chunk_points, end) + 1] for i in range(start, end, polyline_chunk_points)]
+        cv2.polylines(canvas, pieces, False, color, width, cv2.LINE_AA, shift)
+
+# Wide-stroke settings: single-colour strokes at least this wide are stamped with a cached brush
+wide_stroke_width = 40
+brush_phases = 4  # Sub-pixel positions per axis the brush is pre-rendered at
+brush_cache = {}  # Pre-rendered brushes by (width, colour, channels)
+
+# Function to pre-render, once per width and colour, an anti-aliased round brush at every sub-pixel phase
+def get_brush(width, color, channels):
+    if (width, color, channels) not in brush_cache:
+        half = width // 2 + 3  # The body radius below, plus the anti-aliased edge
+        brush = np.full((brush_phases, brush_phases, 2 * half + 1, 2 * half + 1, channels), 255, dtype=np.uint8)
+        for phase_y in range(brush_phases):
+            for phase_x in range(brush_phases):
+                center = ((half << trace_shift) + (phase_x << trace_shift) // brush_phases,
+                          (half << trace_shift) + (phase_y << trace_shift) // brush_phases)
+                # cv2 draws the body of a thick line (width + 1) // 2 pixels to either side, a zero-length
+                # cv2.line comes out a pixel narrower for odd widths; the extra 1/8-1/4 pixel matches its edge
+                radius = (((width + 1) // 2) << trace_shift) + 4 - 2 * (width & 1)
+                cv2.circle(brush[phase_y, phase_x], center, radius, color, -1, cv2.LINE_AA, trace_shift)
+        brush_cache[(width, color, channels)] = (brush, half)
+    return brush_cache[(width, color, channels)]
+
+# Function to stamp a cached brush along a block of fixed-point path points with a darken blend
+# Every stamp rewrites its whole (width + 7)^2 box, so the cost grows as length * width^1.5, not with the new ink
+def stamp_trace_segments(canvas, points, color, width):
+    brush, half = get_brush(width, color, 1 if canvas.ndim == 2 else canvas.shape[2])
+    spacing = max(1.0, math.sqrt(width))  # Keeps the scallops between stamps under a quarter pixel
+
+    # Evenly spaced stamp centres along every segment, all segments at once
+    path = points / (1 << trace_shift)
+    segments = np.diff(path, axis=0)
+    stamps = np.maximum(1, np.ceil(np.hypot(segments[:, 0], segments[:, 1]) / spacing)).astype(np.int64)
+    segment = np.repeat(np.arange(len(segments)), stamps)
+    step = np.arange(len(segment)) - np.repeat(np.cumsum(stamps) - stamps, stamps) + 1
+    centers = np.vstack([path[:1], path[segment] + segments[segment] * (step / stamps[segment])[:, np.newaxis]])
+
+    # Split each centre into a whole pixel and the nearest pre-rendered phase
+    quantized = np.round(centers * brush_phases).astype(np.int64)
+    canvas_height, canvas_width = canvas.shape[:2]
+    for x, y, phase_x, phase_y in zip((quantized[:, 0] // brush_phases).tolist(), (quantized[:, 1] // brush_phases).tolist(),
+                                      (quantized[:, 0] % brush_phases).tolist(), (quantized[:, 1] % brush_phases).tolist()):
+        # Clip the brush to the canvas and darken only the pixels under it
+        left, top = max(x - half, 0), max(y - half, 0)
+        right, bottom = min(x + half + 1, canvas_width), min(y + half + 1, canvas_height)
+        if left >= right or top >= bottom:
+            continue
+        region = canvas[top:bottom, left:right]
+        stamp = brush[phase_y, phase_x, top - y + half:bottom - y + half, left - x + half:right - x + half]
+        np.minimum(region, stamp.reshape(region.shape), out=region)
+
+# Brush check settings comparing the stamped strokes with cv2.polylines
+brush_check = False  # Set to True to measure the stamped strokes against cv2.polylines before rendering
+brush_check_widths = [40, 41, 60, 90, 125]
+brush_check_level = 64  # Pixels further off than this count as visibly different
+brush_check_share = 0.005  # Largest share of the stroke allowed to be visibly different
+
+# Function to draw a test loop with cv2.polylines and with stamps at every check width and compare the two
+def check_brush_against_polylines():
+    # A two-lobed loop cut into pieces no longer than the trace uses, it never moves faster than 900 pixels per radian
+    t = np.linspace(0, 2 * np.pi, int(2 * np.pi * 900 / max_segment_length) + 1)
+    loop = np.stack([width / 2 + 300 * np.cos(t) + 120 * np.cos(5 * t), height / 2 + 300 * np.sin(t) + 120 * np.sin(5 * t)], axis=1)
+    points = np.round(loop * (1 << trace_shift)).astype(np.int32)
+
+    print(f"Stamped strokes against cv2.polylines on a {len(points)}-point loop:")
+    for check_width in brush_check_widths:
+        drawn = np.full((height, width, 3), 255, dtype=np.uint8)
+        stamped = drawn.copy()
+        get_brush(check_width, (0, 0, 0), 3)  # Pre-rendered once per width, keep it out of the timing
+        t0 = time.perf_counter()
+        draw_trace_segments(drawn, points, (0, 0, 0), check_width)
+        t1 = time.perf_counter()
+        stamp_trace_segments(stamped, points, (0, 0, 0), check_width)
+        t2 = time.perf_counter()
+
+        # The loop's two open ends are round caps in cv2 and half-brushes in the stamps, leave them out
+        difference = np.ascontiguousarray(cv2.absdiff(drawn, stamped).max(axis=2))
+        cv2.circle(difference, (int(loop[0, 0]), int(loop[0, 1])), check_width + 4, 0, -1)
+        share = np.count_nonzero(difference > brush_check_level) / np.count_nonzero(drawn.min(axis=2) < 255)
+        print(f"  width {check_width}: max difference {difference.max()}, {share:.2%} of the stroke past {brush_check_level}, "
+              f"polylines {(t1 - t0) * 1000:.1f} ms, stamps {(t2 - t1) * 1000:.1f} ms")
+        assert share <= brush_check_share, f"Stamped width {check_width} strays from cv2.polylines on {share:.2%} of the stroke"
+
+if brush_check:
+    check_brush_against_polylines()
+
+# Pixel tolerance for the closure search when the speeds have no exact period
+closure_tolerance = 2.0
+
+# Function to find the first frame at which the pen comes back to its starting point
+def predict_closure_frame(radii, speeds, angles, max_frames, tolerance=closure_tolerance):
+    # Arms turning at the same speed act as a single arm, and arms that cancel out do not change the period
+    closure_frame = 1
+    phase_errors = []
+    for speed in np.unique(speeds):
+        same_speed = speeds == speed
+        amplitude = np.sum(radii[same_speed] * np.exp(1j * angles[same_speed]))
+        if speed == 0 or abs(amplitude) < 1e-9:
+            continue
+
+        # An arm turning p / q turns per frame is back where it started every q frames
+        turns = speed / (2 * np.pi)
+        fraction = Fraction(turns).limit_denominator(int(max_frames))
+        closure_frame = math.lcm(closure_frame, fraction.denominator)
+        phase_errors.append(abs(float(fraction) - turns) * 2 * np.pi)
+
+    # The period is exact if no arm is off by more than a nanoradian when the curve closes
+    if closure_frame <= max_frames and max(phase_errors, default=0.0) * closure_frame < 1e-9:
+        return closure_frame, True
+
+    # Fall back to searching the trajectory for the first return within the tolerance
+    first_x, first_y = compute_trajectory(radii, speeds, angles, 1)
+    left_start = False  # The pen has to move away before a return counts
+    for start_frame in range(1, int(max_frames) + 1, chunk_frames):
+        num_frames = min(chunk_frames, int(max_frames) + 1 - start_frame)
+        joints_x, joints_y = compute_trajectory(radii, speeds, angles, num_frames, start_frame)
+        distance_squared = (joints_x[:, -1] - first_x[0, -1]) ** 2 + (joints_y[:, -1] - first_y[0, -1]) ** 2
+        near_start = distance_squared <= tolerance ** 2
+
+        # Ignore the frames before the pen first leaves the tolerance around the start
+        if not left_start:
+            away = np.flatnonzero(~near_start)
+            if len(away) == 0:
+                continue
+            near_start[:away[0]] = False
+            left_start = True
+
+        returns = np.flatnonzero(near_start)
+        if len(returns) > 0:
+            return start_frame + int(returns[0]), False
+
+    # The curve does not close within the frame budget
+    return None, False
+
+# Time-lapse settings: every output frame advances steps_per_frame simulation steps
+steps_per_frame = 1  # Steps per output frame when no target duration is set
+target_duration = 30  # Seconds of video per closed curve, None keeps steps_per_frame as set
+frame_steps = steps_per_frame  # Steps per output frame for the current curve
+
+# Function to work out the hue of every sub-step between two rows of the sub-step table
+def compute_sub_step_hues(offsets, first_row, last_row, hue):
+    # Row first_row is one simulation step after the step drawn with the given hue
+    sub_steps = np.diff(offsets[first_row:last_row + 2])
+    step_index = np.repeat(np.arange(len(sub_steps)), sub_steps)
+    position = np.arange(len(step_index)) - (offsets[first_row:last_row + 1] - offsets[first_row])[step_index] + 1
+    return (hue + hue_step * (step_index + position / sub_steps[step_index])) % 360
+
+# Function to draw a block of the sub-step table with the width and colour rules of the current curve
+def draw_trace_block(canvas, points, offsets, first_row, last_row, hue):
+    polyline = points[offsets[first_row]:offsets[last_row + 1] + 1]
+    # Check the random_color flag to determine whether to draw in black or color
+    if random_color:
+        # Draw in black, wide strokes with the cached brush
+        if line_width >= wide_stroke_width:
+            stamp_trace_segments(canvas, polyline, (0, 0, 0), line_width)
+        else:
+            draw_trace_segments(canvas, polyline, (0, 0, 0), line_width)
+    else:
+        # Use the color-changing logic, the hue moves on smoothly across the sub-steps
+        sub_step_hues = compute_sub_step_hues(offsets, first_row, last_row, hue)
+        draw_trace_segments(canvas, polyline, hue_colors(hue_lut, sub_step_hues), line_width)
+
+# Function to draw a whole closed curve in one batched pass, as the video loop leaves it on its closing frame
+def render_poster(canvas, radii, speeds, angles, closure_frame, hue):
+    # Row 0 is the step before frame 0, the video loop starts drawing at row 1
+    points, offsets = compute_sub_steps(radii, speeds, angles, closure_frame + 1)
+    draw_trace_block(canvas, points, offsets, 1, closure_frame, hue)
+
+# Function to reset the drawing conditions and clear the screen
+def reset_drawing_conditions():
+    global trace_canvas, arms_canvas, line_width, frame_steps, block_steps  # Make sure these variables are accessible and modifiable inside the function
+    N = random.randint(2, 2)
+    angles = np.zeros(N)
+    radii = np.random.uniform(0, height // 3, N) * 1.0
+    denominators = np.array([-8, -7, -6, -5, -4, -3, -2, 2, 3, 4, 5, 6, 7, 8])
+    speeds = np.pi / np.random.choice(denominators, N)/10
+    # Reset the canvases to white
+    trace_canvas[:] = 255  # Clear trace canvas
+    arms_canvas[:] = 255   # Clear arms canvas
+    
+    # Set a new random line width only once when resetting conditions
+    line_width = random.randint(5, 125)
+
+    # Work out up front the frame at which this curve closes
+    closure_frame, exact = predict_closure_frame(radii, speeds, angles, max_steps)
+    if closure_frame is None:
+        print(f"Curve does not close within {max_steps} frames.")
+    elif exact:
+        print(f"Curve closes exactly after {closure_frame} frames.")
+    else:
+        print(f"Curve returns within {closure_tolerance} pixels of its start after {closure_frame} frames.")
+
+    # Squeeze the whole curve into the target duration
+    if target_duration is not None and closure_frame is not None:
+        frame_steps = max(1, math.ceil(closure_frame / (target_duration * fps)))
+    else:
+        frame_steps = steps_per_frame
+    print(f"Drawing {frame_steps} simulation steps per output frame.")
+
+    # Trajectory blocks always hold at least one output frame of steps
+    block_steps = max(chunk_frames, frame_steps)
+
+    return N, angles, radii, speeds, closure_frame
+
+# Initialize variables for each arm
+N, angles, radii, speeds, closure_frame = reset_drawing_conditions()
+
+# Precompute the first block of the trajectory
+cycle_frame = 0  # Last simulation step drawn in the current cycle
+path_start = 0   # Simulation step of the first row of the current block
+joints_x, joints_y = compute_trajectory(radii, speeds, angles, block_steps)
+sub_step_points, sub_step_offsets = compute_sub_steps(radii, speeds, angles, block_steps)
+
+drawing_started = False  # Flag to avoid drawing the initial line from the center
+
+# Random HSL color for the trace
+hue = np.random.uniform(0, 360)  # Random hue between 0 and 360
+hue_step = 0.5  # Hue change per frame
+saturation = 100  # Fully saturated
+lightness = 50  # Moderate lightness
+hue_lut = build_hue_lut(saturation, lightness)  # Colours of the whole hue circle, built once
+
+# Start time
+start_time = time.time()
+
+if poster_mode:
+    # The whole closed path in one pass, no arms, compositing or encoding
+    if closure_frame is None:
+        print(f"Curve does not close within {max_steps} frames, no poster to draw.")
+    else:
+        render_poster(trace_canvas, radii, speeds, angles, closure_frame, hue)
+        cv2.imwrite(image_file, trace_canvas)
+        elapsed_time = time.time() - start_time
+        print(f"Drew the closed curve in {elapsed_time * 1000:.1f} milliseconds.")
+        print(f"Image saved as {image_file}")
+else:
+    try:
+        while frame_count < max_frames:
+            # Advance the simulation by this frame's steps, stopping on the step that closes the curve
+            last_step = cycle_frame + frame_steps if drawing_started else 0
+            if closure_frame is not None:
+                last_step = min(last_step, closure_frame)
+
+            # Compute the next block of the trajectory once this frame's steps run past the current one
+            if last_step - path_start >= block_steps:
+                path_start = cycle_frame + 1
+                joints_x, joints_y = compute_trajectory(radii, speeds, angles, block_steps, path_start)
+                sub_step_points, sub_step_offsets = compute_sub_steps(radii, speeds, angles, block_steps, path_start)
+
+            # Only the arms at the last step are shown
+            row = last_step - path_start
+            frame_joints_x = joints_x[row].tolist()
+            frame_joints_y = joints_y[row].tolist()
+
+            # Reset the arms canvas to be blank for each frame
+            arms_canvas[:] = 255  # White background
+
+            # Loop through each arm to draw it
+            for j in range(N):
+                arm_start = (frame_joints_x[j], frame_joints_y[j])
+                arm_end = (frame_joints_x[j + 1], frame_joints_y[j + 1])
+
+                # Draw the arm as a line from the previous joint to the next one in black
+                cv2.line(arms_canvas, arm_start, arm_end, (0, 0, 0), 5, cv2.LINE_AA)
+
+                # Draw black circles at each articulation point
+                cv2.circle(arms_canvas, arm_start, 10, (0, 0, 0), -1)  # Black circle at articulation point
+                cv2.circle(arms_canvas, arm_end, 10, (0, 0, 0), -1)  # Black circle at the next articulation point
+
+            # Draw every sub-stepped segment simulated for this frame in one batch
+            if drawing_started:
+                draw_trace_block(trace_canvas, sub_step_points, sub_step_offsets, cycle_frame + 1 - path_start, row, hue)
+
+            # Mark drawing as started after the first valid point
+            if not drawing_started:
+                drawing_started = True
+
+            # Normalize the trace canvas and arms canvas to range [0, 1] for multiplication
+            trace_canvas_normalized = trace_canvas.astype(np.float32) / 255.0
+            arms_canvas_normalized = arms_canvas.astype(np.float32) / 255.0
+
+            # Multiply the two canvases (element-wise)
+            multiplied_frame = trace_canvas_normalized * arms_canvas_normalized
+
+            # Rescale back to [0, 255] and convert to uint8
+            final_frame = (multiplied_frame * 255).astype(np.uint8)
+
+            # Write the combined frame to the video
+            if monochrome and not grayscale_writer:
+                # Expand to three channels only at the encoder boundary
+                cv2.cvtColor(final_frame, cv2.COLOR_GRAY2BGR, dst=bgr_frame)
+                out.write(bgr_frame)
+            else:
+                out.write(final_frame)
+
+            frame_count += 1
+
+            # Gradually change the hue (for example, by 0.5 per simulation step)
+            hue = (hue + hue_step * (last_step - cycle_frame)) % 360
+            cycle_frame = last_step
+
+            # End the cycle on the frame that closes the curve, no per-frame distance test needed
+            if closure_frame is not None and cycle_frame >= closure_frame:
+                print(f"Curve closed after {closure_frame} frames, restarting conditions.")
+                # Reset the drawing conditions and continue
+                N, angles, radii, speeds, closure_frame = reset_drawing_conditions()
+                drawing_started = False
+                cycle_frame = 0
+                path_start = 0
+                joints_x, joints_y = compute_trajectory(radii, speeds, angles, block_steps)
+                sub_step_points, sub_step_offsets = compute_sub_steps(radii, speeds, angles, block_steps)
+
+            # Print statistics every 1000 frames
+            if frame_count % 1000 == 0:
+                elapsed_time = time.time() - start_time
+                progress = frame_count / max_frames * 100
+                estimated_total_time = elapsed_time / (frame_count / max_frames)
+                estimated_end_time = start_time + estimated_total_time
+                remaining_time = estimated_end_time - time.time()
+
+                print(f"Frame {frame_count}/{max_frames} - Progress: {progress:.2f}%")
+                print(f"Elapsed Time: {elapsed_time:.2f} seconds")
+                print(f"Estimated Total Time: {estimated_total_time:.2f} seconds")
+                print(f"Estimated Time Remaining: {remaining_time:.2f} seconds")
+
+            # Check if the user pressed the 'q' key to exit early
+            if cv2.waitKey(1) & 0xFF == ord('q'):
+                break
+    finally:
+        # Ensure the video writer and window are closed properly
+        out.release()
+        print(f"Video saved as {output_file}")